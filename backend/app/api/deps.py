@@ -22,3 +22,16 @@ async def get_lesson_by_id(
             detail=f"Lesson with id {lesson_id} not found",
         )
     return lesson
+
+
+async def get_lesson_summary_by_id(
+    lesson_id: int, repository: LessonLearnedRepository = Depends(get_lesson_repository)
+):
+    """Dependency to get a lesson's summary fields by ID, raising 404 if not found"""
+    summary = await repository.get_summary_fields(lesson_id)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Lesson with id {lesson_id} not found",
+        )
+    return summary
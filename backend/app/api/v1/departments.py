@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.api.deps import get_lesson_repository
 from app.schemas import (
     DepartmentListResponse,
@@ -11,6 +11,7 @@ from app.services.department_ai_service import DepartmentAIService
 from app.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import orjson
 
 router = APIRouter(prefix="/departments", tags=["departments"])
 
@@ -39,7 +40,8 @@ async def get_departments(
 
 @router.get(
     "/{department}/lessons",
-    response_model=List[dict],
+    response_model=None,
+    responses={200: {"model": List[dict]}},
     summary="Get lessons by department",
     description="Retrieve all lessons learned for a specific department",
 )
@@ -70,7 +72,11 @@ async def get_department_lessons(
                 }
             )
 
-        return lesson_summaries
+        # Encode the whole list in one call instead of validating each row
+        # against the response model
+        return Response(
+            content=orjson.dumps(lesson_summaries), media_type="application/json"
+        )
 
     except Exception as e:
         raise HTTPException(
@@ -1,38 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Response,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_lesson_repository, get_lesson_by_id
+from app.api.deps import (
+    get_lesson_repository,
+    get_lesson_by_id,
+    get_lesson_summary_by_id,
+)
 from app.schemas import (
     LessonLearnedCreate,
     LessonLearnedUpdate,
     LessonLearnedResponse,
     LessonLearnedListResponse,
-    PaginationInfo,
+    LessonLearnedSummary,
     SuccessResponse,
 )
-from app.utils.database_utils import LessonLearnedRepository
+from app.utils.database_utils import (
+    LessonLearnedRepository,
+    encode_cursor,
+    decode_cursor,
+)
 from app.models.lesson_learned import LessonLearned
-from app.services.lesson_ai_service import LessonAIService
+from app.services.lesson_ai_service import (
+    LessonAIService,
+    generate_lesson_ai_analysis,
+)
+from app.services.database_search_service import precompute_lesson_embedding
+from app.services.solution_search_service import invalidate_search_cache
 from app.database import get_db
-from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from app.config import settings
+from app.api.v1.health import db_breaker
+from datetime import datetime, timezone
+import asyncio
+import orjson
 
 router = APIRouter(prefix="/lessons", tags=["lessons"])
 
+# List queries may hold at most half the pool, leaving the rest for writes,
+# detail reads and health checks
+LIST_SEMAPHORE = asyncio.Semaphore(max(1, settings.db_pool_size // 2))
+
+# Columns returned by the detail endpoint, in response schema order
+LESSON_RESPONSE_FIELDS = tuple(LessonLearnedResponse.model_fields)
+
 
 @router.post(
     "/",
     response_model=LessonLearnedResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Create a new lesson learned",
-    description="Create a new lesson learned record with AI analysis",
+    description="Create a new lesson learned record; AI analysis is generated in "
+    "the background and appears on the lesson once ready",
 )
 async def create_lesson(
-    lesson_data: LessonLearnedCreate, db: AsyncSession = Depends(get_db)
+    lesson_data: LessonLearnedCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
 ):
-    """Create a new lesson learned record with AI analysis"""
+    """Create a new lesson learned record and queue its AI analysis"""
     try:
         ai_service = LessonAIService(db)
-        lesson = await ai_service.create_lesson_with_ai_analysis(lesson_data)
+        lesson = await ai_service.create_lesson(lesson_data)
+        invalidate_search_cache()
+        background_tasks.add_task(generate_lesson_ai_analysis, lesson.id)
+        background_tasks.add_task(
+            precompute_lesson_embedding, lesson.id, lesson.problem_description
+        )
         return lesson
     except Exception as e:
         raise HTTPException(
@@ -43,18 +82,24 @@ async def create_lesson(
 
 @router.get(
     "/{lesson_id}",
-    response_model=LessonLearnedResponse,
+    response_model=None,
+    responses={200: {"model": LessonLearnedResponse}},
     summary="Get a lesson learned by ID",
     description="Retrieve a specific lesson learned record by its ID",
 )
 async def get_lesson(lesson: LessonLearned = Depends(get_lesson_by_id)):
     """Get a lesson learned record by ID"""
-    return lesson
+    # The row was validated on write, so encode its columns directly instead of
+    # building a LessonLearnedResponse for every read
+    payload = {field: getattr(lesson, field) for field in LESSON_RESPONSE_FIELDS}
+    payload["attachments"] = payload["attachments"] or []
+    return Response(content=orjson.dumps(payload), media_type="application/json")
 
 
 @router.get(
     "/",
-    response_model=LessonLearnedListResponse,
+    response_model=None,
+    responses={200: {"model": LessonLearnedListResponse}},
     summary="Get all lessons learned",
     description="Retrieve a paginated list of lessons learned with optional filtering and search",
 )
@@ -68,69 +113,100 @@ async def get_lessons(
     search: str = Query(None, description="Search term"),
     sort_by: str = Query("created_at", description="Sort field"),
     sort_order: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: str = Query(
+        None,
+        description="Cursor from a previous response's next_cursor; pages by "
+        "newest first and takes precedence over page/sort",
+    ),
     repository: LessonLearnedRepository = Depends(get_lesson_repository),
 ):
     """Get all lessons learned with filtering, pagination, and search"""
-    try:
-        # Normalize department name to lowercase for consistency
-        if department:
-            department = department.lower()
-
-        # Calculate skip for pagination
-        skip = (page - 1) * limit
-
-        # Get lessons with filters
-        lessons = await repository.get_all(
-            skip=skip,
-            limit=limit,
-            department=department,
-            severity=severity,
-            commodity=commodity,
-            supplier=supplier,
-            search=search,
-            sort_by=sort_by,
-            sort_order=sort_order,
+    # Fail fast while the database is known to be down instead of queueing
+    if db_breaker.is_open():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable, please retry shortly",
         )
 
-        # Get total count for pagination with the same filters
-        total_lessons = await repository.get_all(
-            limit=10000,  # Get a large number to count all
-            department=department,
-            severity=severity,
-            commodity=commodity,
-            supplier=supplier,
-            search=search,
-        )
-        total = len(total_lessons)
-
-        # Calculate pagination info
-        total_pages = (total + limit - 1) // limit
-        has_next = page < total_pages
-        has_prev = page > 1
-
-        pagination = PaginationInfo(
-            page=page,
-            limit=limit,
-            total=total,
-            pages=total_pages,
-            has_next=has_next,
-            has_prev=has_prev,
-        )
+    # Bulkhead: cap concurrent list queries so they can't take the whole pool
+    async with LIST_SEMAPHORE:
+        try:
+            # Normalize department name to lowercase for consistency
+            if department:
+                department = department.lower()
+
+            filters = dict(
+                department=department,
+                severity=severity,
+                commodity=commodity,
+                supplier=supplier,
+                search=search,
+            )
 
-        return LessonLearnedListResponse(
-            items=lessons,
-            total=total,
-            page=page,
-            limit=limit,
-            has_next=has_next,
-            has_prev=has_prev,
-        )
+            if cursor:
+                # Keyset pagination: seek past the cursor instead of using OFFSET
+                try:
+                    cursor_created_at, cursor_id = decode_cursor(cursor)
+                except ValueError as e:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+                    )
+
+                lessons = await repository.get_all_after(
+                    cursor_created_at, cursor_id, limit=limit + 1, **filters
+                )
+                total = await repository.count(**filters)
+                has_next = len(lessons) > limit
+                lessons = lessons[:limit]
+                has_prev = True
+            else:
+                # Calculate skip for pagination
+                skip = (page - 1) * limit
+
+                # Fetch the page and the filtered total in a single query
+                lessons, total = await repository.get_all_with_total(
+                    skip=skip,
+                    limit=limit,
+                    sort_by=sort_by,
+                    sort_order=sort_order,
+                    **filters,
+                )
+
+                # Calculate pagination info
+                has_next = page * limit < total
+                has_prev = page > 1
+
+            # Cursors follow the newest-first order, so only offer one for that order
+            newest_first = sort_by == "created_at" and sort_order.lower() == "desc"
+            next_cursor = None
+            if has_next and lessons and (cursor or newest_first):
+                last = lessons[-1]
+                next_cursor = encode_cursor(last["created_at"], last["id"])
+
+            # Rows are already plain column mappings, so skip per-item pydantic
+            # validation and encode the payload straight to JSON bytes
+            return Response(
+                content=orjson.dumps(
+                    {
+                        "items": lessons,
+                        "total": total,
+                        "page": page,
+                        "limit": limit,
+                        "has_next": has_next,
+                        "has_prev": has_prev,
+                        "next_cursor": next_cursor,
+                    }
+                ),
+                media_type="application/json",
+            )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve lessons: {str(e)}",
-        )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to retrieve lessons: {str(e)}",
+            )
 
 
 @router.put(
@@ -142,26 +218,29 @@ async def get_lessons(
 async def update_lesson(
     lesson_id: int,
     lesson_update: LessonLearnedUpdate,
+    background_tasks: BackgroundTasks,
     repository: LessonLearnedRepository = Depends(get_lesson_repository),
 ):
     """Update a lesson learned record"""
     try:
-        # Check if lesson exists
-        existing_lesson = await repository.get_by_id(lesson_id)
-        if not existing_lesson:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lesson with id {lesson_id} not found",
-            )
-
-        # Update lesson
+        # Update lesson; no row back means it doesn't exist
         update_data = lesson_update.model_dump(exclude_unset=True)
+        if update_data.get("attachments", ()) is None:
+            del update_data["attachments"]
         updated_lesson = await repository.update(lesson_id, update_data)
 
         if not updated_lesson:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update lesson",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Lesson with id {lesson_id} not found",
+            )
+
+        invalidate_search_cache()
+        if "problem_description" in update_data:
+            background_tasks.add_task(
+                precompute_lesson_embedding,
+                lesson_id,
+                updated_lesson.problem_description,
             )
 
         return updated_lesson
@@ -186,27 +265,20 @@ async def delete_lesson(
 ):
     """Delete a lesson learned record"""
     try:
-        # Check if lesson exists
-        existing_lesson = await repository.get_by_id(lesson_id)
-        if not existing_lesson:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lesson with id {lesson_id} not found",
-            )
-
-        # Delete lesson
+        # Delete lesson; nothing deleted means it doesn't exist
         success = await repository.delete(lesson_id)
 
         if not success:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete lesson",
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Lesson with id {lesson_id} not found",
             )
 
+        invalidate_search_cache()
         return SuccessResponse(
             message=f"Lesson with id {lesson_id} deleted successfully",
             data={"deleted_id": lesson_id},
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=datetime.now(timezone.utc).isoformat(),
         )
 
     except HTTPException:
@@ -220,22 +292,14 @@ async def delete_lesson(
 
 @router.get(
     "/{lesson_id}/summary",
-    response_model=dict,
+    response_model=None,
+    responses={200: {"model": LessonLearnedSummary}},
     summary="Get lesson summary",
     description="Get a summary of a specific lesson learned",
 )
-async def get_lesson_summary(lesson: LessonLearned = Depends(get_lesson_by_id)):
+async def get_lesson_summary(summary: dict = Depends(get_lesson_summary_by_id)):
     """Get a summary of a lesson learned"""
-    return {
-        "id": lesson.id,
-        "commodity": lesson.commodity,
-        "department": lesson.department,
-        "severity": lesson.severity,
-        "lesson_summary": (
-            lesson.ai_analysis.get("lesson_summary") if lesson.ai_analysis else None
-        ),
-        "created_at": lesson.created_at,
-    }
+    return Response(content=orjson.dumps(summary), media_type="application/json")
 
 
 @router.post(
@@ -248,7 +312,9 @@ async def regenerate_ai_analysis(lesson_id: int, db: AsyncSession = Depends(get_
     """Regenerate AI analysis for a lesson learned"""
     try:
         ai_service = LessonAIService(db)
-        updated_lesson = await ai_service.update_lesson_ai_analysis(lesson_id)
+        updated_lesson = await ai_service.update_lesson_ai_analysis(
+            lesson_id, use_cache=False
+        )
 
         if not updated_lesson:
             raise HTTPException(
@@ -1,11 +1,25 @@
+import asyncio
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    status,
+    UploadFile,
+    File,
+    Form,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
+from app.api.deps import get_lesson_repository
 from app.services.lesson_ai_service import LessonAIService
+from app.services.database_search_service import precompute_lesson_embedding
+from app.services.solution_search_service import invalidate_search_cache
 from app.services.file_upload_service import file_upload_service
 from app.schemas.lesson_learned import LessonLearnedResponse
 from app.models.lesson_learned import SeverityLevel
+from app.utils.database_utils import LessonLearnedRepository
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +35,7 @@ router = APIRouter(prefix="/lessons", tags=["lessons-with-files"])
     description="Create a new lesson learned record with file attachments and AI analysis",
 )
 async def create_lesson_with_files(
+    background_tasks: BackgroundTasks,
     # Required fields
     commodity: str = Form(..., description="Commodity name"),
     error_location: str = Form(..., description="Location where error occurred"),
@@ -55,31 +70,6 @@ async def create_lesson_with_files(
                 detail=f"Invalid severity level: {severity}. Must be one of: low, medium, high, critical",
             )
 
-        # Upload files if provided
-        uploaded_files = []
-        if attachments:
-            try:
-                upload_result = await file_upload_service.upload_multiple_files(
-                    attachments
-                )
-
-                if upload_result.failed_count > 0:
-                    logger.warning(
-                        f"Some files failed to upload: {upload_result.failed_uploads}"
-                    )
-
-                # Collect successfully uploaded filenames
-                uploaded_files = [
-                    upload.saved_filename for upload in upload_result.successful_uploads
-                ]
-
-            except Exception as e:
-                logger.error(f"File upload failed: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File upload failed: {str(e)}",
-                )
-
         # Create lesson data
         from app.schemas.lesson_learned import LessonLearnedCreate
 
@@ -94,17 +84,57 @@ async def create_lesson_with_files(
             department=department,
             severity=severity_enum,
             reporter_name=reporter_name,
-            attachments=uploaded_files,
         )
 
-        # Create lesson with AI analysis
+        # The AI analysis only reads the text fields, so start it now and let
+        # it run while the files upload
         ai_service = LessonAIService(db)
-        lesson = await ai_service.create_lesson_with_ai_analysis(lesson_data)
+        ai_task = asyncio.create_task(ai_service.generate_ai_analysis(lesson_data))
+
+        try:
+            # Upload files if provided
+            uploaded_files = []
+            if attachments:
+                try:
+                    upload_result = await file_upload_service.upload_multiple_files(
+                        attachments
+                    )
+
+                    if upload_result.failed_count > 0:
+                        logger.warning(
+                            f"Some files failed to upload: {upload_result.failed_uploads}"
+                        )
+
+                    # Collect successfully uploaded filenames
+                    uploaded_files = [
+                        upload.saved_filename
+                        for upload in upload_result.successful_uploads
+                    ]
+
+                except Exception as e:
+                    logger.error(f"File upload failed: {e}")
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File upload failed: {str(e)}",
+                    )
+
+            # Create lesson with AI analysis
+            lesson = await ai_service.create_lesson_with_ai_analysis(
+                lesson_data.model_copy(update={"attachments": uploaded_files}),
+                ai_analysis=ai_task,
+            )
+        finally:
+            # Don't leave the analysis running if the lesson wasn't created
+            ai_task.cancel()
 
         logger.info(
             f"Successfully created lesson {lesson.id} with {len(uploaded_files)} attachments"
         )
 
+        invalidate_search_cache()
+        background_tasks.add_task(
+            precompute_lesson_embedding, lesson.id, lesson.problem_description
+        )
         return lesson
 
     except HTTPException:
@@ -126,22 +156,10 @@ async def create_lesson_with_files(
 async def add_attachments_to_lesson(
     lesson_id: int,
     attachments: List[UploadFile] = File(..., description="Files to attach"),
-    db: AsyncSession = Depends(get_db),
+    repository: LessonLearnedRepository = Depends(get_lesson_repository),
 ):
     """Add file attachments to an existing lesson learned record"""
     try:
-        from app.utils.database_utils import LessonLearnedRepository
-
-        repository = LessonLearnedRepository(db)
-
-        # Check if lesson exists
-        lesson = await repository.get_by_id(lesson_id)
-        if not lesson:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lesson with id {lesson_id} not found",
-            )
-
         # Upload new files
         upload_result = await file_upload_service.upload_multiple_files(attachments)
 
@@ -155,14 +173,16 @@ async def add_attachments_to_lesson(
             upload.saved_filename for upload in upload_result.successful_uploads
         ]
 
-        # Combine with existing attachments
-        existing_attachments = lesson.attachments or []
-        all_attachments = existing_attachments + new_files
-
-        # Update lesson with new attachments
-        updated_lesson = await repository.update(
-            lesson_id, {"attachments": all_attachments}
-        )
+        # Append to the lesson's attachments in the same statement that
+        # checks the lesson exists
+        updated_lesson = await repository.add_attachments(lesson_id, new_files)
+        if not updated_lesson:
+            for new_file in new_files:
+                await file_upload_service.delete_file(new_file)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Lesson with id {lesson_id} not found",
+            )
 
         logger.info(
             f"Successfully added {len(new_files)} attachments to lesson {lesson_id}"
@@ -187,38 +207,27 @@ async def add_attachments_to_lesson(
     description="Remove a specific file attachment from a lesson learned record",
 )
 async def remove_attachment_from_lesson(
-    lesson_id: int, filename: str, db: AsyncSession = Depends(get_db)
+    lesson_id: int,
+    filename: str,
+    repository: LessonLearnedRepository = Depends(get_lesson_repository),
 ):
     """Remove a specific file attachment from a lesson learned record"""
     try:
-        from app.utils.database_utils import LessonLearnedRepository
-
-        repository = LessonLearnedRepository(db)
-
-        # Check if lesson exists
-        lesson = await repository.get_by_id(lesson_id)
-        if not lesson:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lesson with id {lesson_id} not found",
-            )
-
-        # Check if attachment exists
-        existing_attachments = lesson.attachments or []
-        if filename not in existing_attachments:
+        # Remove the attachment in one statement that only matches a lesson
+        # which has it
+        updated_lesson = await repository.remove_attachment(lesson_id, filename)
+        if not updated_lesson:
+            # Only a failed removal needs to know which 404 it was
+            if not await repository.get_by_id(lesson_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Lesson with id {lesson_id} not found",
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Attachment {filename} not found in lesson {lesson_id}",
             )
 
-        # Remove attachment from list
-        updated_attachments = [att for att in existing_attachments if att != filename]
-
-        # Update lesson
-        updated_lesson = await repository.update(
-            lesson_id, {"attachments": updated_attachments}
-        )
-
         # Delete file from storage
         await file_upload_service.delete_file(filename)
 
@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    BackgroundTasks,
+    Query,
+    Request,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from sqlalchemy import select
 from datetime import datetime
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models.solution_search import (
     SolutionSearch,
     SavedSolution,
     SearchStatus,
     SearchSource,
 )
+from app.services.rag_search_service import RAGSearchService
+from app.services.web_search_service import WebSearchService
 from app.schemas.solution_search import (
     SolutionSearchRequest,
     SolutionSearchResponse,
@@ -87,8 +97,11 @@ def convert_search_to_response(search: SolutionSearch) -> SolutionSearchResponse
         status=search.status,
         results=results,
         summary=search.summary,
+        # Databases created before the column became a float still hold text
         confidence_score=(
-            float(search.confidence_score) if search.confidence_score else None
+            float(search.confidence_score)
+            if search.confidence_score is not None
+            else None
         ),
         search_progress=progress,
         created_at=search.created_at,
@@ -97,8 +110,25 @@ def convert_search_to_response(search: SolutionSearch) -> SolutionSearchResponse
 
 
 # Background task for processing search using real search services
-async def process_solution_search(search_id: int, db: AsyncSession):
+async def process_solution_search(
+    search_id: int,
+    rag_service: Optional[RAGSearchService] = None,
+    web_service: Optional[WebSearchService] = None,
+):
     """Background task to process solution search using real search services"""
+    # The request's session is closed once the response is sent, so the task
+    # takes its own from the shared pool
+    async with AsyncSessionLocal() as db:
+        await _process_solution_search(search_id, db, rag_service, web_service)
+
+
+async def _process_solution_search(
+    search_id: int,
+    db: AsyncSession,
+    rag_service: Optional[RAGSearchService] = None,
+    web_service: Optional[WebSearchService] = None,
+):
+    """Run the search for a stored request and record its outcome"""
     try:
         from app.services.solution_search_service import SolutionSearchService
         from app.schemas.solution_search import SolutionSearchRequest
@@ -119,7 +149,7 @@ async def process_solution_search(search_id: int, db: AsyncSession):
         )
 
         # Initialize solution search service
-        solution_service = SolutionSearchService(db)
+        solution_service = SolutionSearchService(db, rag_service, web_service)
 
         # Perform comprehensive search
         search_results = await solution_service.perform_comprehensive_search(
@@ -162,6 +192,7 @@ async def process_solution_search(search_id: int, db: AsyncSession):
 async def submit_solution_search(
     problem_data: SolutionSearchRequest,
     background_tasks: BackgroundTasks,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """Submit a new solution search request"""
@@ -181,7 +212,12 @@ async def submit_solution_search(
         await db.refresh(search)
 
         # Start background processing
-        background_tasks.add_task(process_solution_search, search.id, db)
+        background_tasks.add_task(
+            process_solution_search,
+            search.id,
+            request.app.state.rag_search_service,
+            request.app.state.web_search_service,
+        )
 
         # Return initial response
         return convert_search_to_response(search)
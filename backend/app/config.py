@@ -4,9 +4,23 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite+aiosqlite:///./lessons_learned.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds
+    db_pool_recycle: int = 1800  # seconds
+    db_pool_pre_ping: bool = True
+    db_use_pgbouncer: bool = False  # Disable app-side pooling behind pgbouncer
+
+    # Health checks
+    health_db_timeout_s: float = 2.0
+    health_breaker_failure_threshold: int = 5
+    health_breaker_reset_s: float = 30.0
 
     # OpenAI
     openai_api_key: str
+    openai_max_retries: int = 5  # SDK retries 429/5xx with exponential backoff
+    openai_bulk_concurrency: int = 8  # Parallel requests per bulk call
+    openai_response_cache_size: int = 512  # Cached completions kept in memory
 
     # File Upload
     upload_dir: str = "./uploads"
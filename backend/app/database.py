@@ -1,13 +1,50 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+from contextlib import AsyncExitStack
+import orjson
+from sqlalchemy import String, inspect, text
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from app.config import settings
 
 
+def _engine_options() -> dict:
+    """Build connection pool options for the async engine"""
+    if settings.db_use_pgbouncer:
+        # pgbouncer already pools connections, so don't pool twice; asyncpg's
+        # prepared statements also need JIT off in transaction pooling mode
+        options = {"poolclass": NullPool}
+        if settings.database_url.startswith("postgresql+asyncpg"):
+            options["connect_args"] = {"server_settings": {"jit": "off"}}
+        return options
+
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+
+def _json_dumps(value) -> str:
+    """Encode JSON column values with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
     future=True,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_engine_options(),
 )
 
 # Create async session factory
@@ -25,10 +62,13 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncSession:
     """Dependency to get database session"""
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
+
+
+async def get_db_conn() -> AsyncConnection:
+    """Dependency to get a pooled connection, independent of the request session"""
+    async with engine.connect() as conn:
+        yield conn
 
 
 async def init_db():
@@ -39,4 +79,58 @@ async def init_db():
         from app.models.solution_search import SolutionSearch, SearchResultCache
         from app.models.department_ai_cache import DepartmentAISummaryCache
 
+        if conn.dialect.name == "postgresql":
+            # Required by the trigram search index
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
         await conn.run_sync(Base.metadata.create_all)
+        if conn.dialect.name == "postgresql":
+            await conn.run_sync(_convert_score_columns)
+        await conn.run_sync(_create_missing_indexes)
+
+
+# Score columns that older databases created as strings
+SCORE_COLUMNS = (
+    ("solution_searches", "confidence_score"),
+    ("search_result_cache", "relevance_score"),
+)
+
+
+def _convert_score_columns(conn):
+    """Convert score columns existing tables still store as text to floats"""
+    # SQLite can't change a column's type in place; its rows keep their text
+    # values and readers convert them
+    inspector = inspect(conn)
+    for table, column in SCORE_COLUMNS:
+        for info in inspector.get_columns(table):
+            if info["name"] == column and isinstance(info["type"], String):
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ALTER COLUMN {column} "
+                        f"TYPE double precision "
+                        f"USING NULLIF({column}, '')::double precision"
+                    )
+                )
+
+
+def _create_missing_indexes(conn):
+    """Create indexes declared on models that existing tables don't have yet"""
+    # create_all skips tables that already exist, including their new indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def warm_pool():
+    """Open pool_size connections up front so early requests skip the handshake"""
+    if settings.db_use_pgbouncer:
+        return  # NullPool keeps no idle connections to warm
+
+    async def _ping(stack: AsyncExitStack):
+        conn = await stack.enter_async_context(engine.connect())
+        await conn.execute(text("SELECT 1"))
+
+    # Hold every connection until all are open, otherwise the pool would keep
+    # handing the first one back out
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*[_ping(stack) for _ in range(settings.db_pool_size)])
@@ -4,10 +4,16 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
+import atexit
+import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from app.config import settings
-from app.database import init_db
+from app.database import init_db, warm_pool
+from app.services.rag_search_service import RAGSearchService
+from app.services.web_search_service import WebSearchService
 from app.api.v1 import (
     lessons,
     departments,
@@ -18,6 +24,26 @@ from app.api.v1 import (
     solution_search,
 )
 
+# Log records are queued and written by a listener thread, so logging from a
+# request never blocks the event loop on stderr
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_output = logging.StreamHandler()
+_log_output.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+_log_listener = QueueListener(_log_queue, _log_output)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# The queue handler only renders message and traceback; the listener's
+# handler adds the timestamp, level and logger name
+_log_enqueue = QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter())
+
+# Application loggers follow the debug flag; third-party libraries stay at INFO
+logging.basicConfig(level=logging.INFO, handlers=[_log_enqueue])
+logging.getLogger("app").setLevel(logging.DEBUG if settings.debug else logging.INFO)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,10 +57,22 @@ async def lifespan(app: FastAPI):
         print(f"❌ Failed to initialize database: {e}")
         raise
 
+    try:
+        await warm_pool()
+        print("✅ Database connection pool warmed")
+    except Exception as e:
+        print(f"⚠️ Failed to warm database connection pool: {e}")
+
+    # Search services hold caches, indexes and API clients, so every solution
+    # search shares one of each
+    app.state.rag_search_service = RAGSearchService()
+    app.state.web_search_service = WebSearchService()
+
     yield
 
     # Shutdown
     print("🛑 Shutting down Lessons Learned API...")
+    app.state.rag_search_service.executor.shutdown(wait=False)
 
 
 # Create FastAPI application
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON, Index
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -52,5 +52,20 @@ class LessonLearned(Base):
         nullable=False,
     )
 
+    __table_args__ = (
+        # Matches the list endpoint's filter + created_at sort pattern
+        Index(
+            "ix_lessons_dept_severity_created", "department", "severity", "created_at"
+        ),
+        Index("ix_lessons_created_desc", created_at.desc()),
+        # Trigram index to speed up ILIKE '%term%' searches (PostgreSQL only)
+        Index(
+            "ix_lessons_problem_description_trgm",
+            "problem_description",
+            postgresql_using="gin",
+            postgresql_ops={"problem_description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<LessonLearned(id={self.id}, commodity='{self.commodity}', department='{self.department}')>"
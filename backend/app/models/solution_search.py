@@ -1,4 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Enum,
+    JSON,
+    ForeignKey,
+    Index,
+    Float,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -38,7 +49,7 @@ class SolutionSearch(Base):
     status = Column(
         Enum(SearchStatus), nullable=False, default=SearchStatus.searching, index=True
     )
-    confidence_score = Column(String(10), nullable=True)  # Overall confidence score
+    confidence_score = Column(Float, nullable=True)  # Overall confidence score
     summary = Column(Text, nullable=True)  # AI-generated summary
 
     # Progress tracking
@@ -66,6 +77,11 @@ class SolutionSearch(Base):
         "SearchResultCache", back_populates="search", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Covers the statistics query's GROUP BY status, department count
+        Index("ix_solution_searches_status_department", "status", "department"),
+    )
+
 
 class SearchResultCache(Base):
     __tablename__ = "search_result_cache"
@@ -78,9 +94,7 @@ class SearchResultCache(Base):
 
     # Result data
     result_data = Column(JSON, nullable=False)  # Store the actual search results
-    relevance_score = Column(
-        String(10), nullable=True
-    )  # Overall relevance for this source
+    relevance_score = Column(Float, nullable=True)  # Overall relevance for this source
     result_count = Column(Integer, nullable=False, default=0)  # Number of results found
 
     # Metadata
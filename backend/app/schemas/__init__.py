@@ -1,74 +1,90 @@
-# Import all schemas for easy access
-from .base import (
-    TimestampMixin,
-    AIAnalysisBase,
-    AIAnalysisResponse,
-    DepartmentSummaryResponse
-)
+# Schemas are imported from their submodule on first access (PEP 562), so
+# importing app.schemas doesn't build every model up front
+import importlib
 
-from .lesson_learned import (
-    LessonLearnedBase,
-    LessonLearnedCreate,
-    LessonLearnedUpdate,
-    LessonLearnedResponse,
-    LessonLearnedWithAIAnalysis,
-    LessonLearnedListResponse,
-    LessonLearnedSummary
-)
+_SUBMODULE_EXPORTS = {
+    "base": (
+        "TimestampMixin",
+        "AIAnalysisBase",
+        "AIAnalysisResponse",
+        "DepartmentSummaryResponse",
+    ),
+    "lesson_learned": (
+        "LessonLearnedBase",
+        "LessonLearnedCreate",
+        "LessonLearnedUpdate",
+        "LessonLearnedResponse",
+        "LessonLearnedWithAIAnalysis",
+        "LessonLearnedListItem",
+        "LessonLearnedListResponse",
+        "LessonLearnedSummary",
+    ),
+    "filters": (
+        "LessonLearnedFilters",
+        "DepartmentFilters",
+        "StatisticsFilters",
+    ),
+    "statistics": (
+        "SeverityStatistics",
+        "DepartmentStatistics",
+        "OverallStatistics",
+        "TrendData",
+        "TrendStatistics",
+    ),
+    "file_upload": (
+        "FileUploadResponse",
+        "MultipleFileUploadResponse",
+        "FileValidationError",
+        "FileUploadRequest",
+    ),
+    "ai_integration": (
+        "OpenAIRequest",
+        "DepartmentSummaryRequest",
+        "OpenAIResponse",
+        "DepartmentSummaryResponse",
+        "AIProcessingStatus",
+    ),
+    "solution_search": (
+        "SolutionSearchRequest",
+        "SolutionSearchResponse",
+        "SearchStatusResponse",
+        "SearchRefinementRequest",
+        "SearchRefinementResponse",
+        "SaveSolutionRequest",
+        "SavedSolutionResponse",
+        "SolutionSearchListResponse",
+        "SavedSolutionListResponse",
+        "SearchResult",
+        "SearchProgress",
+    ),
+    "common": (
+        "ErrorResponse",
+        "SuccessResponse",
+        "HealthCheckResponse",
+        "PaginationInfo",
+        "ListResponse",
+        "DepartmentListResponse",
+        "ValidationErrorDetail",
+        "ValidationErrorResponse",
+    ),
+}
 
-from .filters import (
-    LessonLearnedFilters,
-    DepartmentFilters,
-    StatisticsFilters
-)
+# Later submodules win for names exported twice, as with the eager imports
+_LAZY = {
+    name: f"{__name__}.{module}"
+    for module, names in _SUBMODULE_EXPORTS.items()
+    for name in names
+}
 
-from .statistics import (
-    SeverityStatistics,
-    DepartmentStatistics,
-    OverallStatistics,
-    TrendData,
-    TrendStatistics
-)
 
-from .file_upload import (
-    FileUploadResponse,
-    MultipleFileUploadResponse,
-    FileValidationError,
-    FileUploadRequest
-)
-
-from .ai_integration import (
-    OpenAIRequest,
-    DepartmentSummaryRequest,
-    OpenAIResponse,
-    DepartmentSummaryResponse,
-    AIProcessingStatus
-)
-
-from .solution_search import (
-    SolutionSearchRequest,
-    SolutionSearchResponse,
-    SearchStatusResponse,
-    SearchRefinementRequest,
-    SearchRefinementResponse,
-    SaveSolutionRequest,
-    SavedSolutionResponse,
-    SolutionSearchListResponse,
-    SavedSolutionListResponse,
-    SearchResult,
-    SearchProgress
-)
-
-from .common import (
-    ErrorResponse,
-    SuccessResponse,
-    HealthCheckResponse,
-    PaginationInfo,
-    ListResponse,
-    DepartmentListResponse,
-    ValidationErrorDetail,
-    ValidationErrorResponse
-)
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Base schemas
@@ -83,6 +99,7 @@ __all__ = [
     "LessonLearnedUpdate", 
     "LessonLearnedResponse",
     "LessonLearnedWithAIAnalysis",
+    "LessonLearnedListItem",
     "LessonLearnedListResponse",
     "LessonLearnedSummary",
     
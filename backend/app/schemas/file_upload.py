@@ -1,6 +1,20 @@
 from typing import List, Dict
 from pydantic import BaseModel, Field, validator
 
+# MIME types an upload configuration may allow
+VALID_MIME_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/jpg",
+        "image/png",
+        "image/gif",
+        "application/pdf",
+        "text/plain",
+        "application/msword",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    }
+)
+
 
 class FileUploadResponse(BaseModel):
     """Response schema for file upload"""
@@ -51,19 +65,10 @@ class FileUploadRequest(BaseModel):
 
     @validator("allowed_types")
     def validate_allowed_types(cls, v):
-        valid_types = [
-            "image/jpeg",
-            "image/jpg",
-            "image/png",
-            "image/gif",
-            "application/pdf",
-            "text/plain",
-            "application/msword",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ]
         for file_type in v:
-            if file_type not in valid_types:
+            if file_type not in VALID_MIME_TYPES:
                 raise ValueError(
-                    f"Invalid file type: {file_type}. Allowed types: {valid_types}"
+                    f"Invalid file type: {file_type}. "
+                    f"Allowed types: {', '.join(sorted(VALID_MIME_TYPES))}"
                 )
         return v
@@ -1,11 +1,24 @@
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from datetime import date
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from app.models.lesson_learned import SeverityLevel
 
+SortField = Literal[
+    "created_at",
+    "updated_at",
+    "commodity",
+    "department",
+    "severity",
+    "part_number",
+    "supplier",
+]
+
 
 class LessonLearnedFilters(BaseModel):
     """Schema for filtering lessons learned"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     page: int = Field(1, ge=1, description="Page number")
     limit: int = Field(10, ge=1, le=100, description="Number of items per page")
     department: Optional[str] = Field(None, description="Filter by department")
@@ -15,34 +28,22 @@ class LessonLearnedFilters(BaseModel):
     commodity: Optional[str] = Field(None, description="Filter by commodity")
     supplier: Optional[str] = Field(None, description="Filter by supplier")
     search: Optional[str] = Field(None, min_length=1, description="Search term")
-    sort_by: str = Field("created_at", description="Field to sort by")
-    sort_order: str = Field("desc", description="Sort order (asc or desc)")
-
-    @validator("sort_by")
-    def validate_sort_by(cls, v):
-        allowed_fields = [
-            "created_at",
-            "updated_at",
-            "commodity",
-            "department",
-            "severity",
-            "part_number",
-            "supplier",
-        ]
-        if v not in allowed_fields:
-            raise ValueError(f"sort_by must be one of: {', '.join(allowed_fields)}")
-        return v
-
-    @validator("sort_order")
+    sort_by: SortField = Field("created_at", description="Field to sort by")
+    sort_order: Literal["asc", "desc"] = Field(
+        "desc", description="Sort order (asc or desc)"
+    )
+
+    @field_validator("sort_order", mode="before")
+    @classmethod
     def validate_sort_order(cls, v):
-        if v.lower() not in ["asc", "desc"]:
-            raise ValueError("sort_order must be 'asc' or 'desc'")
-        return v.lower()
+        return v.lower() if isinstance(v, str) else v
 
 
 class DepartmentFilters(BaseModel):
     """Schema for department-specific filters"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     department: str = Field(..., min_length=1, description="Department name")
     include_ai_analysis: bool = Field(
         True, description="Include AI analysis in results"
@@ -52,11 +53,17 @@ class DepartmentFilters(BaseModel):
 class StatisticsFilters(BaseModel):
     """Schema for statistics filters"""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     department: Optional[str] = Field(
         None, description="Filter statistics by department"
     )
-    start_date: Optional[str] = Field(None, description="Start date (YYYY-MM-DD)")
-    end_date: Optional[str] = Field(None, description="End date (YYYY-MM-DD)")
+    start_date: Optional[date] = Field(
+        None, description="Start date", examples=["2024-01-15"]
+    )
+    end_date: Optional[date] = Field(
+        None, description="End date", examples=["2024-01-31"]
+    )
     severity: Optional[SeverityLevel] = Field(
         None, description="Filter by severity level"
     )
@@ -1,9 +1,15 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Optional, List, Tuple
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from app.models.lesson_learned import SeverityLevel
 from app.schemas.base import AIAnalysisResponse, TimestampMixin
 
+# Required free-text field with no upper length limit
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1)]
+
+# Shared by the schemas read straight from ORM rows
+_ORM_CONFIG = ConfigDict(from_attributes=True)
+
 
 class LessonLearnedBase(BaseModel):
     """Base schema for lesson learned data"""
@@ -17,17 +23,17 @@ class LessonLearnedBase(BaseModel):
     supplier: Optional[str] = Field(
         None, max_length=255, description="Supplier name (optional)"
     )
-    error_location: str = Field(
-        ..., min_length=1, description="Location where error occurred"
+    error_location: NonEmptyStr = Field(
+        ..., description="Location where error occurred"
     )
-    problem_description: str = Field(
-        ..., min_length=1, description="Description of the problem"
+    problem_description: NonEmptyStr = Field(
+        ..., description="Description of the problem"
     )
-    missed_detection: str = Field(
-        ..., min_length=1, description="How the detection was missed"
+    missed_detection: NonEmptyStr = Field(
+        ..., description="How the detection was missed"
     )
-    provided_solution: str = Field(
-        ..., min_length=1, description="Solution that was provided"
+    provided_solution: NonEmptyStr = Field(
+        ..., description="Solution that was provided"
     )
     department: str = Field(
         ..., min_length=1, max_length=100, description="Department name"
@@ -39,16 +45,10 @@ class LessonLearnedBase(BaseModel):
         max_length=100,
         description="Name of the person reporting the issue",
     )
-    attachments: Optional[List[str]] = Field(
-        default=[], description="List of attachment file paths"
+    attachments: List[str] = Field(
+        default_factory=list, description="List of attachment file paths"
     )
 
-    @validator("attachments")
-    def validate_attachments(cls, v):
-        if v is None:
-            return []
-        return v
-
 
 class LessonLearnedCreate(LessonLearnedBase):
     """Schema for creating a new lesson learned"""
@@ -62,20 +62,14 @@ class LessonLearnedUpdate(BaseModel):
     commodity: Optional[str] = Field(None, min_length=1, max_length=255)
     part_number: Optional[str] = Field(None, max_length=100)
     supplier: Optional[str] = Field(None, max_length=255)
-    error_location: Optional[str] = Field(None, min_length=1)
-    problem_description: Optional[str] = Field(None, min_length=1)
-    missed_detection: Optional[str] = Field(None, min_length=1)
-    provided_solution: Optional[str] = Field(None, min_length=1)
+    error_location: Optional[NonEmptyStr] = None
+    problem_description: Optional[NonEmptyStr] = None
+    missed_detection: Optional[NonEmptyStr] = None
+    provided_solution: Optional[NonEmptyStr] = None
     department: Optional[str] = Field(None, min_length=1, max_length=100)
     severity: Optional[SeverityLevel] = None
     reporter_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    attachments: Optional[List[str]] = None
-
-    @validator("attachments")
-    def validate_attachments(cls, v):
-        if v is None:
-            return []
-        return v
+    attachments: Optional[List[str]] = None  # None leaves attachments unchanged
 
 
 class LessonLearnedResponse(LessonLearnedBase, TimestampMixin):
@@ -84,8 +78,7 @@ class LessonLearnedResponse(LessonLearnedBase, TimestampMixin):
     id: int
     ai_analysis: Optional[AIAnalysisResponse] = None
 
-    class Config:
-        from_attributes = True
+    model_config = _ORM_CONFIG
 
 
 class LessonLearnedWithAIAnalysis(LessonLearnedResponse):
@@ -93,19 +86,41 @@ class LessonLearnedWithAIAnalysis(LessonLearnedResponse):
 
     ai_analysis: AIAnalysisResponse
 
-    class Config:
-        from_attributes = True
+
+class LessonLearnedListItem(TimestampMixin):
+    """Schema for a lesson learned in list responses (without AI analysis and attachments)"""
+
+    id: int
+    commodity: str
+    part_number: Optional[str] = None
+    supplier: Optional[str] = None
+    error_location: str
+    problem_description: str
+    missed_detection: str
+    provided_solution: str
+    department: str
+    severity: SeverityLevel
+    reporter_name: str
+
+    model_config = _ORM_CONFIG
 
 
 class LessonLearnedListResponse(BaseModel):
     """Schema for paginated list of lessons learned"""
 
-    items: List[LessonLearnedResponse]
+    items: Tuple[LessonLearnedListItem, ...]
     total: int
-    page: int
+    page: int = Field(description="Requested page; echoed but unused in cursor mode")
     limit: int
-    has_next: bool
-    has_prev: bool
+    has_next: bool = Field(
+        description="Page mode: page * limit < total. Cursor mode: whether "
+        "another row follows this page in keyset order"
+    )
+    has_prev: bool = Field(
+        description="Page mode: page > 1. Cursor mode: always true, since a "
+        "cursor is only issued after an earlier page"
+    )
+    next_cursor: Optional[str] = None
 
 
 class LessonLearnedSummary(BaseModel):
@@ -118,5 +133,4 @@ class LessonLearnedSummary(BaseModel):
     created_at: datetime
     lesson_summary: Optional[str] = None  # From AI analysis
 
-    class Config:
-        from_attributes = True
+    model_config = _ORM_CONFIG
@@ -1,10 +1,28 @@
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from datetime import datetime
 from app.models.solution_search import SearchStatus, SearchSource
 from app.models.lesson_learned import SeverityLevel
 from .base import TimestampMixin
 
+# Model configs shared across the schemas below
+_ENUM_VALUES_CONFIG = ConfigDict(use_enum_values=True)
+_ORM_CONFIG = ConfigDict(from_attributes=True)
+_ORM_ENUM_VALUES_CONFIG = ConfigDict(from_attributes=True, use_enum_values=True)
+
+
+@dataclass
+class RequestFeatures:
+    """Request-derived inputs computed once and shared by the search backends"""
+
+    # Database text search terms from the description and keywords
+    search_terms: List[str] = field(default_factory=list)
+    # Embedding of the normalized description used by the RAG vector search
+    query_embedding: Optional[List[float]] = None
+    # Embedding of the description plus keywords used by the database search
+    incident_embedding: Optional[List[float]] = None
+
 
 # Request Schemas
 class SolutionSearchRequest(BaseModel):
@@ -90,8 +108,7 @@ class SearchResult(BaseModel):
         default={}, description="Additional metadata"
     )
 
-    class Config:
-        use_enum_values = True
+    model_config = _ENUM_VALUES_CONFIG
 
 
 class SearchProgress(BaseModel):
@@ -125,8 +142,7 @@ class SolutionSearchResponse(BaseModel):
         default=None, description="When the search was completed"
     )
 
-    class Config:
-        use_enum_values = True
+    model_config = _ENUM_VALUES_CONFIG
 
 
 class SearchStatusResponse(BaseModel):
@@ -138,8 +154,7 @@ class SearchStatusResponse(BaseModel):
     )
     created_at: datetime = Field(..., description="When the search was created")
 
-    class Config:
-        use_enum_values = True
+    model_config = _ENUM_VALUES_CONFIG
 
 
 class SearchRefinementResponse(BaseModel):
@@ -165,8 +180,7 @@ class SavedSolutionResponse(BaseModel):
     user_notes: Optional[str] = Field(default=None, description="User notes")
     saved_at: datetime = Field(..., description="When the solution was saved")
 
-    class Config:
-        use_enum_values = True
+    model_config = _ENUM_VALUES_CONFIG
 
 
 class SolutionSearchListResponse(BaseModel):
@@ -201,8 +215,7 @@ class SolutionSearchBase(BaseModel):
     search_sources: Optional[List[str]] = ["database", "rag", "web"]
     min_relevance_score: Optional[str] = "0.3"
 
-    class Config:
-        from_attributes = True
+    model_config = _ORM_CONFIG
 
 
 class SolutionSearchCreate(SolutionSearchBase):
@@ -212,42 +225,37 @@ class SolutionSearchCreate(SolutionSearchBase):
 class SolutionSearchUpdate(BaseModel):
     status: Optional[SearchStatus] = None
     search_results: Optional[Dict[str, Any]] = None
-    confidence_score: Optional[str] = None
+    confidence_score: Optional[float] = None
     summary: Optional[str] = None
     progress: Optional[Dict[str, Any]] = None
     completed_at: Optional[datetime] = None
 
-    class Config:
-        use_enum_values = True
+    model_config = _ENUM_VALUES_CONFIG
 
 
 class SolutionSearchInDB(SolutionSearchBase, TimestampMixin):
     id: int
     search_results: Optional[Dict[str, Any]] = {}
     status: SearchStatus
-    confidence_score: Optional[str] = None
+    confidence_score: Optional[float] = None
     summary: Optional[str] = None
     progress: Optional[Dict[str, Any]] = {}
     completed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = _ORM_ENUM_VALUES_CONFIG
 
 
 class SearchResultCacheBase(BaseModel):
     search_id: int
     source: SearchSource
     result_data: Dict[str, Any]
-    relevance_score: Optional[str] = None
+    relevance_score: Optional[float] = None
     result_count: int = 0
     search_query: Optional[str] = None
     search_duration: Optional[str] = None
     error_message: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = _ORM_ENUM_VALUES_CONFIG
 
 
 class SearchResultCacheCreate(SearchResultCacheBase):
@@ -257,9 +265,7 @@ class SearchResultCacheCreate(SearchResultCacheBase):
 class SearchResultCacheInDB(SearchResultCacheBase, TimestampMixin):
     id: int
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = _ORM_ENUM_VALUES_CONFIG
 
 
 class SavedSolutionBase(BaseModel):
@@ -274,9 +280,7 @@ class SavedSolutionBase(BaseModel):
     user_notes: Optional[str] = None
     is_helpful: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = _ORM_ENUM_VALUES_CONFIG
 
 
 class SavedSolutionCreate(SavedSolutionBase):
@@ -287,6 +291,4 @@ class SavedSolutionInDB(SavedSolutionBase, TimestampMixin):
     id: int
     saved_at: datetime
 
-    class Config:
-        from_attributes = True
-        use_enum_values = True
+    model_config = _ORM_ENUM_VALUES_CONFIG
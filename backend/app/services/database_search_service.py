@@ -1,20 +1,457 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, case, literal
+import asyncio
+import hashlib
+import logging
 import re
+import sqlite3
+import threading
 from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from cachetools import LRUCache, TTLCache
+import numpy as np
 
-from app.models.lesson_learned import LessonLearned
-from app.schemas.solution_search import SearchResult, SearchSource
+from app.database import AsyncSessionLocal
+from app.models.lesson_learned import LessonLearned, SeverityLevel
+from app.schemas.solution_search import RequestFeatures, SearchResult, SearchSource
+
+logger = logging.getLogger(__name__)
 
 try:
     from langchain_openai import OpenAIEmbeddings
-    from sklearn.metrics.pairwise import cosine_similarity
 
     LANGCHAIN_AVAILABLE = True
 except ImportError:
     LANGCHAIN_AVAILABLE = False
 
+try:
+    import faiss
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+SEVERITY_VALUES = frozenset(level.value for level in SeverityLevel)
+
+# Words of three or more letters used as text search terms
+SEARCH_TERM_PATTERN = re.compile(r"\b[a-zA-Z]{3,}\b")
+MAX_SEARCH_TERMS = 10
+
+# Common stop words dropped from text search terms
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "must",
+        "can",
+        "this",
+        "that",
+        "these",
+        "those",
+    }
+)
+
+# Candidate sets up to this size are scored exactly; larger ones are searched
+# through the HNSW graph
+LESSON_EXACT_SEARCH_MAX = 1024
+
+# The graph is rebuilt once this many lessons have been (re-)embedded since
+# the last build; until then they are scored exactly
+LESSON_INDEX_REBUILD_THRESHOLD = 256
+
+# FAISS HNSW parameters for the lesson index
+LESSON_HNSW_M = 32
+LESSON_EF_SEARCH = 64
+
+# Cosine similarity below which lessons aren't considered similar
+MIN_SEMANTIC_SIMILARITY = 0.3
+
+# Embeddings by model and text: an in-memory LRU in front of a SQLite file, so
+# repeated queries and unchanged lessons aren't embedded again after a restart
+EMBEDDING_CACHE_PATH = Path("rag") / "lesson_embeddings.sqlite"
+EMBEDDING_CACHE_SIZE = 8192
+
+# SQLite's default limit on bound parameters per statement is 999
+SQLITE_MAX_PARAMS = 500
+
+# Semantic search results are reused for paraphrased queries: query embeddings
+# are bucketed by random-projection LSH, and a cached query in the same bucket
+# counts as a hit when its cosine similarity is at least this high
+SEMANTIC_CACHE_TABLES = 8
+SEMANTIC_CACHE_BITS = 16
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.95
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_TTL = 300  # seconds
+
+
+class EmbeddingCache:
+    """Embedding vectors keyed by model and text, kept in memory and on disk"""
+
+    def __init__(self, path: Path, maxsize: int):
+        self._path = path
+        self._memory: LRUCache = LRUCache(maxsize=maxsize)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Cache key for a text embedded with a model"""
+        return hashlib.sha256(f"{model}|{text}".encode()).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, "np.ndarray"]:
+        """
+        Look up cached embeddings
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Embeddings for the keys that were cached
+        """
+        with self._lock:
+            found = {key: self._memory[key] for key in keys if key in self._memory}
+            missing = [key for key in keys if key not in found]
+            try:
+                for start in range(0, len(missing), SQLITE_MAX_PARAMS):
+                    chunk = missing[start : start + SQLITE_MAX_PARAMS]
+                    rows = self._connect().execute(
+                        "SELECT hash, vec FROM embeddings WHERE hash IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    for key, blob in rows:
+                        found[key] = self._memory[key] = np.frombuffer(
+                            blob, dtype=np.float32
+                        )
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache unavailable: %s", e)
+        return found
+
+    def put_many(self, embeddings: Dict[bytes, "np.ndarray"]) -> None:
+        """
+        Cache embeddings in memory and on disk
+
+        Args:
+            embeddings: Embeddings by cache key
+        """
+        with self._lock:
+            self._memory.update(embeddings)
+            try:
+                db = self._connect()
+                db.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    [(key, vec.tobytes()) for key, vec in embeddings.items()],
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Could not persist embeddings: %s", e)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use (caller holds the lock)"""
+        if self._db is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self._path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+
+class LessonEmbeddingIndex:
+    """
+    Problem description embeddings of lessons, kept across requests
+
+    Each lesson is embedded once, and again only when its text changes, instead
+    of re-embedding every lesson on every search.
+    """
+
+    def __init__(self):
+        # Unit-length vectors as rows of one contiguous matrix, each lesson's
+        # row, and a digest of the text each was embedded from
+        self._matrix: Optional["np.ndarray"] = None
+        self._rows: Dict[int, int] = {}
+        self._digests: Dict[int, bytes] = {}
+        self._index: Optional["faiss.Index"] = None
+        # Lessons whose current vector is in the graph
+        self._indexed: set = set()
+        self._lock = asyncio.Lock()
+
+    async def update(
+        self,
+        lessons: Iterable[Tuple[int, str]],
+        embed_documents: Callable[[List[str]], List[List[float]]],
+    ) -> None:
+        """
+        Embed lessons that are new or whose text changed since they were embedded
+
+        Args:
+            lessons: (lesson id, text) pairs
+            embed_documents: Blocking function embedding a batch of texts
+        """
+        async with self._lock:
+            stale = []
+            for lesson_id, text in lessons:
+                digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+                if self._digests.get(lesson_id) != digest:
+                    stale.append((lesson_id, text, digest))
+            if not stale:
+                return
+
+            loop = asyncio.get_running_loop()
+            embeddings = await loop.run_in_executor(
+                None, embed_documents, [text for _, text, _ in stale]
+            )
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            self._reserve(len(self._rows) + len(stale), vectors.shape[1])
+            for (lesson_id, _, digest), vector in zip(stale, vectors):
+                row = self._rows.setdefault(lesson_id, len(self._rows))
+                self._matrix[row] = vector
+                self._digests[lesson_id] = digest
+                self._indexed.discard(lesson_id)
+
+            unindexed = len(self._rows) - len(self._indexed)
+            if FAISS_AVAILABLE and unindexed >= LESSON_INDEX_REBUILD_THRESHOLD:
+                ids = np.fromiter(self._rows, dtype=np.int64, count=len(self._rows))
+                self._index = await loop.run_in_executor(
+                    None, self._build_index, ids, self._matrix[: len(ids)].copy()
+                )
+                self._indexed = set(self._rows)
+                logger.debug(
+                    "Built lesson HNSW index with %d vectors", len(self._indexed)
+                )
+
+    def search(
+        self, query_embedding: List[float], candidate_ids: List[int], k: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the lessons most similar to a query among the candidates
+
+        Args:
+            query_embedding: Query embedding
+            candidate_ids: Ids of the lessons to consider
+            k: Maximum number of results
+
+        Returns:
+            (lesson id, cosine similarity) pairs, most similar first
+        """
+        query = np.array(query_embedding, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+
+        candidates = [i for i in candidate_ids if i in self._rows]
+        if len(candidates) > LESSON_EXACT_SEARCH_MAX and self._indexed:
+            graph_ids = [i for i in candidates if i in self._indexed]
+            candidates = [i for i in candidates if i not in self._indexed]
+            params = faiss.SearchParametersHNSW(
+                sel=faiss.IDSelectorBatch(np.asarray(graph_ids, dtype=np.int64)),
+                efSearch=max(LESSON_EF_SEARCH, 2 * k),
+            )
+            # The graph's vectors are int8, so over-fetch and rescore its hits
+            # against the float32 vectors below
+            _, ids = self._index.search(query[None, :], 2 * k, params=params)
+            candidates.extend(int(i) for i in ids[0] if i >= 0)
+
+        if not candidates:
+            return []
+
+        rows = np.fromiter(
+            (self._rows[i] for i in candidates), dtype=np.intp, count=len(candidates)
+        )
+        # Vectors are unit length, so one matrix-vector product gives the
+        # cosine similarities
+        scores = self._matrix[rows] @ query
+        hits = sorted(
+            zip(candidates, scores.tolist()), key=lambda hit: hit[1], reverse=True
+        )
+        return hits[:k]
+
+    def _reserve(self, size: int, dim: int) -> None:
+        """Grow the vector matrix to hold at least size rows"""
+        if self._matrix is None:
+            self._matrix = np.empty((max(size, 64), dim), dtype=np.float32)
+        elif size > len(self._matrix):
+            grown = np.empty((max(size, 2 * len(self._matrix)), dim), dtype=np.float32)
+            grown[: len(self._rows)] = self._matrix[: len(self._rows)]
+            self._matrix = grown
+
+    @staticmethod
+    def _build_index(ids: "np.ndarray", matrix: "np.ndarray") -> "faiss.Index":
+        """Build an HNSW graph over int8 (SQ8) copies of vectors (blocking)"""
+        index = faiss.IndexIDMap(
+            faiss.IndexHNSWSQ(
+                matrix.shape[1],
+                faiss.ScalarQuantizer.QT_8bit,
+                LESSON_HNSW_M,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        )
+        index.train(matrix)
+        index.add_with_ids(matrix, ids)
+        return index
+
+
+class SemanticQueryCache:
+    """
+    Semantic search results keyed by query embedding, matched approximately
+
+    Each query embedding is hashed in several tables to the sign pattern of its
+    projections onto random hyperplanes, so near-duplicate queries land in a
+    shared bucket with high probability. Candidates from the buckets are
+    confirmed with an exact cosine check.
+    """
+
+    def __init__(self, tables: int, bits: int, maxsize: int, ttl: float):
+        self._tables = tables
+        self._bits = bits
+        self._projections: Optional["np.ndarray"] = None
+        # Entry id -> (search parameters, unit query vector, results)
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._next_id = 0
+
+    def get(
+        self, query_embedding: List[float], params: Tuple
+    ) -> Optional[List[SearchResult]]:
+        """
+        Find cached results of a sufficiently similar query
+
+        Args:
+            query_embedding: Query embedding
+            params: Search parameters the results must have been computed with
+
+        Returns:
+            Copies of the cached results, or None on a miss
+        """
+        query = self._normalize(query_embedding)
+        for bucket in self._signatures(query):
+            # Drop entries that expired or were evicted
+            entry_ids = [
+                i for i in self._buckets.get(bucket, ()) if i in self._entries
+            ]
+            if entry_ids:
+                self._buckets[bucket] = entry_ids
+            else:
+                self._buckets.pop(bucket, None)
+            for entry_id in entry_ids:
+                entry_params, vector, results = self._entries[entry_id]
+                if (
+                    entry_params == params
+                    and float(vector @ query) >= SEMANTIC_CACHE_MIN_SIMILARITY
+                ):
+                    return [result.model_copy(deep=True) for result in results]
+        return None
+
+    def put(
+        self,
+        query_embedding: List[float],
+        params: Tuple,
+        results: List[SearchResult],
+    ) -> None:
+        """
+        Cache the results of a query
+
+        Args:
+            query_embedding: Query embedding
+            params: Search parameters the results were computed with
+            results: Search results
+        """
+        query = self._normalize(query_embedding)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (
+            params,
+            query,
+            [result.model_copy(deep=True) for result in results],
+        )
+        for bucket in self._signatures(query):
+            self._buckets.setdefault(bucket, []).append(entry_id)
+
+        # Each live entry occupies at most one bucket per table; sweep out
+        # dead ones once the bucket map is twice that size
+        if len(self._buckets) > 2 * self._tables * self._entries.maxsize:
+            self._prune()
+
+    def clear(self) -> None:
+        """Forget every cached query, e.g. after lessons changed"""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def _prune(self) -> None:
+        """Drop expired or evicted entries from the buckets, and empty buckets"""
+        self._entries.expire()
+        live = {}
+        for bucket, entry_ids in self._buckets.items():
+            entry_ids = [i for i in entry_ids if i in self._entries]
+            if entry_ids:
+                live[bucket] = entry_ids
+        self._buckets = live
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> "np.ndarray":
+        vector = np.array(embedding, dtype=np.float32)
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        return vector
+
+    def _signatures(self, query: "np.ndarray") -> List[Tuple[int, bytes]]:
+        """(table, bucket signature) for each LSH table"""
+        if self._projections is None or len(self._projections) != len(query):
+            # Fixed seed so signatures are stable for the process's lifetime
+            rng = np.random.default_rng(0)
+            self._projections = rng.standard_normal(
+                (len(query), self._tables * self._bits)
+            ).astype(np.float32)
+            self._buckets.clear()
+        bits = (query @ self._projections > 0).reshape(self._tables, self._bits)
+        return [
+            (table, np.packbits(row).tobytes()) for table, row in enumerate(bits)
+        ]
+
+
+# Shared by every DatabaseSearchService so embeddings outlive a request
+_embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_SIZE)
+_lesson_index = LessonEmbeddingIndex()
+_semantic_query_cache = SemanticQueryCache(
+    SEMANTIC_CACHE_TABLES,
+    SEMANTIC_CACHE_BITS,
+    SEMANTIC_CACHE_SIZE,
+    SEMANTIC_CACHE_TTL,
+)
+
 
 class DatabaseSearchService:
     """Service for searching through existing lessons learned database using semantic similarity"""
@@ -43,6 +480,9 @@ class DatabaseSearchService:
         severity: str,
         keywords: Optional[List[str]] = None,
         limit: int = 10,
+        min_relevance: float = 0.0,
+        precomputed: Optional[RequestFeatures] = None,
+        raise_errors: bool = False,
     ) -> List[SearchResult]:
         """
         Search for similar incidents in the database using semantic similarity
@@ -53,6 +493,10 @@ class DatabaseSearchService:
             severity: Severity level to consider
             keywords: Optional keywords for enhanced search
             limit: Maximum number of results to return
+            min_relevance: Minimum relevance score for returned results
+            precomputed: Optional search terms and query embedding computed once
+                per request
+            raise_errors: Raise search failures instead of returning no results
 
         Returns:
             List of SearchResult objects
@@ -65,16 +509,30 @@ class DatabaseSearchService:
             # Use semantic similarity if embeddings are available
             if self._embeddings:
                 return await self._semantic_search(
-                    problem_description, department, severity, keywords, limit
+                    problem_description,
+                    department,
+                    severity,
+                    keywords,
+                    limit,
+                    min_relevance,
+                    precomputed,
                 )
             else:
                 # Fallback to text-based search
                 return await self._text_based_search(
-                    problem_description, department, severity, keywords, limit
+                    problem_description,
+                    department,
+                    severity,
+                    keywords,
+                    limit,
+                    min_relevance,
+                    precomputed,
                 )
 
         except Exception as e:
             print(f"Error in database search: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def get_relevant_solutions(
@@ -122,9 +580,8 @@ class DatabaseSearchService:
 
             # Convert to SearchResult objects
             search_results = []
-            for lesson in lessons:
-                relevance_score = self._calculate_keyword_relevance(lesson, keywords)
-
+            relevance_scores = self._calculate_keyword_relevances(lessons, keywords)
+            for lesson, relevance_score in zip(lessons, relevance_scores):
                 search_result = SearchResult(
                     source=SearchSource.database,
                     title=f"Solution: {lesson.commodity}",
@@ -211,6 +668,8 @@ class DatabaseSearchService:
         severity: str,
         keywords: Optional[List[str]] = None,
         limit: int = 10,
+        min_relevance: float = 0.0,
+        precomputed: Optional[RequestFeatures] = None,
     ) -> List[SearchResult]:
         """
         Perform semantic search using embeddings
@@ -221,6 +680,9 @@ class DatabaseSearchService:
             severity: Severity level to consider
             keywords: Optional keywords for enhanced search
             limit: Maximum number of results to return
+            min_relevance: Minimum relevance score for returned results
+            precomputed: Optional search terms and query embedding computed once
+                per request
 
         Returns:
             List of SearchResult objects
@@ -228,85 +690,119 @@ class DatabaseSearchService:
         try:
             print("   → Using semantic similarity search")
 
-            # Get all lessons from the database (with department filter)
-            # We need all fields for the SearchResult, so we fetch the full objects
-            query = select(LessonLearned).where(
-                LessonLearned.department.ilike(f"%{department}%")
-            )
+            # Get embedding for the query
+            if precomputed and precomputed.incident_embedding is not None:
+                query_embedding = precomputed.incident_embedding
+            else:
+                query_embedding = self._embed_query(
+                    self.semantic_query_text(problem_description, keywords)
+                )
 
-            result = await self.db.execute(query)
-            all_lessons = result.scalars().all()
+            # Paraphrases of a recent query reuse its results
+            cache_params = (department, severity, limit, min_relevance)
+            cached = _semantic_query_cache.get(query_embedding, cache_params)
+            if cached is not None:
+                logger.debug("Semantic search cache hit (%d results)", len(cached))
+                return cached
+
+            # Rank on ids and problem descriptions only; full rows are loaded
+            # for the matches alone
+            result = await self.db.execute(
+                select(LessonLearned.id, LessonLearned.problem_description).where(
+                    LessonLearned.department.ilike(f"%{department}%")
+                )
+            )
+            candidates = result.all()
 
-            if not all_lessons:
+            if not candidates:
                 print("   ← No lessons found in database")
                 return []
 
-            print(f"   → Found {len(all_lessons)} lessons in database")
-
-            # Create searchable text for each lesson (only problem_description for similarity)
-            lesson_texts = []
-            for lesson in all_lessons:
-                text = self._create_searchable_text(
-                    lesson
-                )  # Only uses problem_description
-                lesson_texts.append(text)
-
-            # Get embedding for the query
-            query_text = problem_description
-            if keywords:
-                query_text += " " + " ".join(keywords)
-
-            query_embedding = self._embeddings.embed_query(query_text)
+            print(f"   → Found {len(candidates)} lessons in database")
 
-            # Get embeddings for all lessons
-            lesson_embeddings = self._embeddings.embed_documents(lesson_texts)
+            # Only problem_description is embedded, to match similar problems;
+            # lessons embedded on write or by an earlier search are reused
+            await self.index_lessons(
+                (lesson_id, text or "") for lesson_id, text in candidates
+            )
+            # Over-fetch so the severity/recency adjustment can reorder
+            similarities = [
+                (lesson_id, similarity)
+                for lesson_id, similarity in _lesson_index.search(
+                    query_embedding,
+                    [lesson_id for lesson_id, _ in candidates],
+                    limit * 3,
+                )
+                if similarity >= MIN_SEMANTIC_SIMILARITY
+            ]
+            if not similarities:
+                print("   ← Semantic search returned 0 results")
+                _semantic_query_cache.put(query_embedding, cache_params, [])
+                return []
 
-            # Calculate cosine similarities
-            similarities = cosine_similarity([query_embedding], lesson_embeddings)[0]
+            result = await self.db.execute(
+                select(LessonLearned).where(
+                    LessonLearned.id.in_([lesson_id for lesson_id, _ in similarities])
+                )
+            )
+            lessons = {lesson.id: lesson for lesson in result.scalars()}
 
             # Create results with similarity scores
             search_results = []
-            for i, (lesson, similarity) in enumerate(zip(all_lessons, similarities)):
-                # Apply minimum similarity threshold
-                if similarity >= 0.3:
-                    # Adjust score based on severity match and recency
-                    adjusted_score = self._adjust_semantic_score(
-                        similarity, lesson, severity
-                    )
+            for lesson_id, similarity in similarities:
+                lesson = lessons.get(lesson_id)
+                if lesson is None:
+                    # Deleted since it was ranked
+                    continue
+
+                # Adjust score based on severity match and recency
+                adjusted_score = self._adjust_semantic_score(
+                    similarity, lesson, severity
+                )
+                if adjusted_score < min_relevance:
+                    continue
 
-                    search_result = SearchResult(
-                        source=SearchSource.database,
-                        title=f"Similar Issue: {lesson.commodity}",
-                        description=f"Found in {lesson.department} department. {lesson.problem_description[:200]}...",
-                        relevance_score=adjusted_score,
-                        solution=lesson.provided_solution,
-                        metadata={
-                            "incident_id": lesson.id,
-                            "department": lesson.department,
-                            "severity": lesson.severity.value,
-                            "commodity": lesson.commodity,
-                            "error_location": lesson.error_location,
-                            "missed_detection": lesson.missed_detection,
-                            "created_at": lesson.created_at.isoformat(),
-                            "reporter_name": lesson.reporter_name,
-                            "part_number": lesson.part_number,
-                            "supplier": lesson.supplier,
-                            "semantic_similarity": float(similarity),
-                        },
-                    )
-                    search_results.append(search_result)
+                search_result = SearchResult(
+                    source=SearchSource.database,
+                    title=f"Similar Issue: {lesson.commodity}",
+                    description=f"Found in {lesson.department} department. {lesson.problem_description[:200]}...",
+                    relevance_score=adjusted_score,
+                    solution=lesson.provided_solution,
+                    metadata={
+                        "incident_id": lesson.id,
+                        "department": lesson.department,
+                        "severity": lesson.severity.value,
+                        "commodity": lesson.commodity,
+                        "error_location": lesson.error_location,
+                        "missed_detection": lesson.missed_detection,
+                        "created_at": lesson.created_at.isoformat(),
+                        "reporter_name": lesson.reporter_name,
+                        "part_number": lesson.part_number,
+                        "supplier": lesson.supplier,
+                        "semantic_similarity": float(similarity),
+                    },
+                )
+                search_results.append(search_result)
 
             # Sort by relevance score
             search_results.sort(key=lambda x: x.relevance_score, reverse=True)
 
             print(f"   ← Semantic search returned {len(search_results)} results")
-            return search_results[:limit]
+            search_results = search_results[:limit]
+            _semantic_query_cache.put(query_embedding, cache_params, search_results)
+            return search_results
 
         except Exception as e:
             print(f"   ❌ Error in semantic search: {e}")
             # Fallback to text search
             return await self._text_based_search(
-                problem_description, department, severity, keywords, limit
+                problem_description,
+                department,
+                severity,
+                keywords,
+                limit,
+                min_relevance,
+                precomputed,
             )
 
     async def _text_based_search(
@@ -316,6 +812,8 @@ class DatabaseSearchService:
         severity: str,
         keywords: Optional[List[str]] = None,
         limit: int = 10,
+        min_relevance: float = 0.0,
+        precomputed: Optional[RequestFeatures] = None,
     ) -> List[SearchResult]:
         """
         Fallback text-based search (original implementation)
@@ -324,7 +822,12 @@ class DatabaseSearchService:
             print("   → Using text-based search (fallback)")
 
             # Extract key terms from problem description
-            search_terms = self._extract_search_terms(problem_description, keywords)
+            if precomputed:
+                search_terms = precomputed.search_terms
+            else:
+                search_terms = self.extract_search_terms(
+                    problem_description, keywords
+                )
 
             # Build search query
             query = select(LessonLearned).where(
@@ -341,24 +844,38 @@ class DatabaseSearchService:
             if text_conditions:
                 query = query.where(or_(*text_conditions))
 
-            # Order by relevance (recent first, then by severity match)
-            # Use a simpler ordering approach
-            query = query.order_by(LessonLearned.created_at.desc()).limit(
-                limit * 2
-            )  # Get more results to filter by relevance
-
-            result = await self.db.execute(query)
-            lessons = result.scalars().all()
+            min_score = max(0.3, min_relevance)
+            if self.db.bind.dialect.name == "postgresql":
+                # Rank every match in the database (the ILIKEs use the trigram
+                # index) instead of scoring only the most recent ones here
+                relevance = self._relevance_score_sql(search_terms, severity)
+                query = (
+                    query.add_columns(relevance)
+                    .where(relevance >= min_score)
+                    .order_by(relevance.desc(), LessonLearned.created_at.desc())
+                    .limit(limit)
+                )
+                result = await self.db.execute(query)
+                scored = result.tuples().all()
+            else:
+                # Order by relevance (recent first, then by severity match)
+                # Use a simpler ordering approach
+                query = query.order_by(LessonLearned.created_at.desc()).limit(
+                    limit * 2
+                )  # Get more results to filter by relevance
+
+                result = await self.db.execute(query)
+                lessons = result.scalars().all()
+                scored = zip(
+                    lessons,
+                    self._calculate_relevance_scores(lessons, search_terms, severity),
+                )
 
             # Convert to SearchResult objects
             search_results = []
-            for lesson in lessons:
-                relevance_score = self._calculate_relevance_score(
-                    lesson, problem_description, search_terms, severity
-                )
-
+            for lesson, relevance_score in scored:
                 # Only include results with reasonable relevance
-                if relevance_score >= 0.3:
+                if relevance_score >= min_score:
                     search_result = SearchResult(
                         source=SearchSource.database,
                         title=f"Similar Issue: {lesson.commodity}",
@@ -388,10 +905,78 @@ class DatabaseSearchService:
 
         except Exception as e:
             print(f"   ❌ Error in text-based search: {e}")
-            return []
+            raise
+
+    async def index_lessons(self, lessons: Iterable[Tuple[int, str]]) -> None:
+        """
+        Embed lessons' problem descriptions into the shared lesson index
+
+        Args:
+            lessons: (lesson id, problem description) pairs
+        """
+        if self._embeddings is None:
+            return
+        await _lesson_index.update(lessons, self._embed_documents)
+
+    def _embed_query(self, text: str) -> "np.ndarray":
+        """
+        Embed a query, reusing a cached vector when there is one (blocking)
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return self._embed_documents([text])[0]
+
+    def _embed_documents(self, texts: List[str]) -> List["np.ndarray"]:
+        """
+        Embed texts, calling the provider only for those not cached (blocking)
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the order of texts
+        """
+        model = getattr(self._embeddings, "model", "")
+        keys = [EmbeddingCache.key(model, text) for text in texts]
+        embeddings = _embedding_cache.get_many(keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        if missing:
+            vectors = self._embeddings.embed_documents(list(missing.values()))
+            fresh = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(missing, vectors)
+            }
+            _embedding_cache.put_many(fresh)
+            embeddings.update(fresh)
+
+        return [embeddings[key] for key in keys]
+
+    @staticmethod
+    def semantic_query_text(
+        problem_description: str, keywords: Optional[List[str]] = None
+    ) -> str:
+        """
+        Build the text embedded for semantic search
+
+        Args:
+            problem_description: The problem description text
+            keywords: Optional additional keywords
 
-    def _extract_search_terms(
-        self, problem_description: str, keywords: Optional[List[str]] = None
+        Returns:
+            Query text for embedding
+        """
+        if keywords:
+            return problem_description + " " + " ".join(keywords)
+        return problem_description
+
+    @staticmethod
+    def extract_search_terms(
+        problem_description: str, keywords: Optional[List[str]] = None
     ) -> List[str]:
         """
         Extract search terms from problem description and keywords
@@ -408,147 +993,159 @@ class DatabaseSearchService:
         if keywords:
             text += " " + " ".join(keywords).lower()
 
-        # Remove common stop words
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "must",
-            "can",
-            "this",
-            "that",
-            "these",
-            "those",
+        # Extract words (letters only), drop stop words and keep unique terms
+        search_terms = {
+            word
+            for word in SEARCH_TERM_PATTERN.findall(text)
+            if word not in STOP_WORDS
         }
 
-        # Extract words (alphanumeric only)
-        words = re.findall(r"\b[a-zA-Z]{3,}\b", text)
-
-        # Filter out stop words and get unique terms
-        search_terms = list(set([word for word in words if word not in stop_words]))
-
         # Limit to most relevant terms
-        return search_terms[:10]
+        return list(islice(search_terms, MAX_SEARCH_TERMS))
 
-    def _calculate_relevance_score(
+    def _calculate_relevance_scores(
         self,
-        lesson: LessonLearned,
-        problem_description: str,
+        lessons: List[LessonLearned],
         search_terms: List[str],
         target_severity: str,
-    ) -> float:
+    ) -> List[float]:
         """
-        Calculate relevance score for a lesson (focused on problem_description similarity)
+        Calculate relevance scores (focused on problem_description similarity)
 
         Args:
-            lesson: The lesson learned object
-            problem_description: Original problem description
+            lessons: The lesson learned objects
             search_terms: Extracted search terms
             target_severity: Target severity level
 
         Returns:
-            Relevance score between 0.0 and 1.0
+            Relevance score between 0.0 and 1.0 for each lesson
         """
-        score = 0.0
-
-        # Text similarity (60% weight) - focus only on problem_description
-        text_similarity = 0.0
-        if lesson.problem_description:
-            field_lower = lesson.problem_description.lower()
-            matches = sum(1 for term in search_terms if term in field_lower)
-            text_similarity = matches / len(search_terms) if search_terms else 0
-
-        score += text_similarity * 0.6
+        count = len(lessons)
+
+        # Text similarity (60% weight) - share of terms in problem_description
+        if search_terms:
+            matches = np.array(
+                [
+                    [term in description for term in search_terms]
+                    for description in (
+                        (lesson.problem_description or "").lower()
+                        for lesson in lessons
+                    )
+                ],
+                dtype=bool,
+            ).reshape(count, len(search_terms))
+            text_similarity = matches.sum(axis=1) / len(search_terms)
+        else:
+            text_similarity = np.zeros(count)
 
         # Severity match (20% weight)
-        if lesson.severity.value == target_severity:
-            score += 0.2
-
-        # Recency (20% weight) - more recent = higher score
-        days_old = (datetime.utcnow() - lesson.created_at).days
-        recency_score = max(0, 1 - (days_old / 365))  # Decay over a year
-        score += recency_score * 0.2
+        severity_match = np.fromiter(
+            (lesson.severity.value == target_severity for lesson in lessons),
+            dtype=bool,
+            count=count,
+        )
 
-        # Solution quality (20% weight) - longer solutions are often better
-        solution_length = (
-            len(lesson.provided_solution) if lesson.provided_solution else 0
+        # Recency (20% weight) - more recent = higher score, decaying over a year
+        now = datetime.utcnow()
+        days_old = np.fromiter(
+            ((now - lesson.created_at).days for lesson in lessons),
+            dtype=np.float64,
+            count=count,
         )
-        solution_score = min(solution_length / 500, 1.0)  # Normalize to 500 chars
-        score += solution_score * 0.2
+        recency_score = np.maximum(0, 1 - days_old / 365)
+
+        # Solution quality (20% weight) - longer solutions are often better,
+        # normalized to 500 chars
+        solution_length = np.fromiter(
+            (len(lesson.provided_solution or "") for lesson in lessons),
+            dtype=np.float64,
+            count=count,
+        )
+        solution_score = np.minimum(solution_length / 500, 1.0)
 
-        return min(score, 1.0)
+        score = (
+            text_similarity * 0.6
+            + severity_match * 0.2
+            + recency_score * 0.2
+            + solution_score * 0.2
+        )
+        return np.minimum(score, 1.0).tolist()
 
-    def _calculate_keyword_relevance(
-        self, lesson: LessonLearned, keywords: List[str]
-    ) -> float:
+    def _relevance_score_sql(self, search_terms: List[str], target_severity: str):
         """
-        Calculate relevance score based on keyword matches
+        Build the _calculate_relevance_scores formula as a SQL expression
 
         Args:
-            lesson: The lesson learned object
-            keywords: List of keywords
+            search_terms: Extracted search terms
+            target_severity: Target severity level
 
         Returns:
-            Relevance score between 0.0 and 1.0
+            Labeled SQL expression for the relevance score between 0.0 and 1.0
         """
-        if not keywords:
-            return 0.0
+        # Text similarity (60% weight): share of terms in problem_description
+        if search_terms:
+            matches = sum(
+                case(
+                    (LessonLearned.problem_description.ilike(f"%{term}%"), 1),
+                    else_=0,
+                )
+                for term in search_terms
+            )
+            score = matches / float(len(search_terms)) * 0.6
+        else:
+            score = literal(0.0)
 
-        # Check keyword matches in solution and problem description
-        text_to_search = (
-            f"{lesson.provided_solution} {lesson.problem_description}".lower()
+        # Severity match (20% weight)
+        if target_severity in SEVERITY_VALUES:
+            score += case(
+                (LessonLearned.severity == SeverityLevel(target_severity), 0.2),
+                else_=0.0,
+            )
+
+        # Recency (20% weight), decaying over a year of whole days
+        days_old = func.floor(
+            func.extract("epoch", func.now() - LessonLearned.created_at) / 86400
         )
+        score += func.greatest(0.0, 1 - days_old / 365.0) * 0.2
 
-        matches = 0
-        for keyword in keywords:
-            if keyword.lower() in text_to_search:
-                matches += 1
+        # Solution quality (20% weight), normalized to 500 characters
+        solution_length = func.coalesce(
+            func.length(LessonLearned.provided_solution), 0
+        )
+        score += func.least(solution_length / 500.0, 1.0) * 0.2
 
-        return matches / len(keywords)
+        return func.least(score, 1.0).label("relevance_score")
 
-    def _create_searchable_text(self, lesson: LessonLearned) -> str:
+    def _calculate_keyword_relevances(
+        self, lessons: List[LessonLearned], keywords: List[str]
+    ) -> List[float]:
         """
-        Create searchable text from a lesson learned entry
-        For solution search, we focus only on problem_description for better similarity matching
+        Calculate relevance scores based on keyword matches
 
         Args:
-            lesson: The lesson learned object
+            lessons: The lesson learned objects
+            keywords: List of keywords
 
         Returns:
-            Problem description text for semantic search
+            Relevance score between 0.0 and 1.0 for each lesson
         """
-        # For solution search, we only use problem_description to find similar problems
-        return lesson.problem_description or ""
+        if not keywords:
+            return [0.0] * len(lessons)
+
+        # Check keyword matches in solution and problem description
+        keywords = [keyword.lower() for keyword in keywords]
+        matches = np.array(
+            [
+                [keyword in text for keyword in keywords]
+                for text in (
+                    f"{lesson.provided_solution} {lesson.problem_description}".lower()
+                    for lesson in lessons
+                )
+            ],
+            dtype=bool,
+        ).reshape(len(lessons), len(keywords))
+
+        return (matches.sum(axis=1) / len(keywords)).tolist()
 
     def _adjust_semantic_score(
         self, base_similarity: float, lesson: LessonLearned, target_severity: str
@@ -582,3 +1179,32 @@ class DatabaseSearchService:
             score += 0.05
 
         return min(score, 1.0)  # Cap at 1.0
+
+
+def clear_semantic_query_cache() -> None:
+    """Forget cached semantic search results after lessons changed"""
+    _semantic_query_cache.clear()
+
+
+async def precompute_lesson_embedding(
+    lesson_id: int, problem_description: str
+) -> None:
+    """
+    Background job that embeds a created or edited lesson ahead of search
+
+    Keeps the embedding call off the next semantic search. A failure only
+    defers the work: the search embeds whatever lessons are still missing.
+
+    Args:
+        lesson_id: ID of the lesson
+        problem_description: The lesson's problem description
+    """
+    if not LANGCHAIN_AVAILABLE:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            await DatabaseSearchService(session).index_lessons(
+                [(lesson_id, problem_description)]
+            )
+    except Exception as e:
+        logger.warning("Lesson %s will be embedded at search time: %s", lesson_id, e)
@@ -1,12 +1,26 @@
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from cachetools import TTLCache
 from app.models.department_ai_cache import DepartmentAISummaryCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process cache of summary rows (column snapshots) keyed by department, so
+# hot departments skip the database round-trip. Entries are evicted on write.
+_summary_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+
+
+def _snapshot(cache: DepartmentAISummaryCache) -> Dict[str, Any]:
+    """Copy a summary row's column values for the process-local cache"""
+    return {
+        column.key: getattr(cache, column.key)
+        for column in DepartmentAISummaryCache.__table__.columns
+    }
+
 
 class DepartmentAICacheService:
     """Service for managing department AI summary cache"""
@@ -26,16 +40,75 @@ class DepartmentAICacheService:
         Returns:
             Cached summary or None if not found
         """
+        key = department.lower()
+        snapshot = _summary_cache.get(key)
+        if snapshot is not None:
+            # Detached copy; the cached row is never attached to a session
+            return DepartmentAISummaryCache(**snapshot)
+
+        try:
+            cache = await self._load_summary(department)
+        except Exception as e:
+            logger.error(f"Error getting cached summary for {department}: {e}")
+            return None
+
+        if cache:
+            _summary_cache[key] = _snapshot(cache)
+        return cache
+
+    async def get_cached_summaries(
+        self, departments: List[str]
+    ) -> Dict[str, DepartmentAISummaryCache]:
+        """
+        Get cached AI summaries for several departments in one query
+
+        Args:
+            departments: Department names
+
+        Returns:
+            Mapping of lowercased department name to cached summary; departments
+            without a summary are omitted
+        """
+        summaries: Dict[str, DepartmentAISummaryCache] = {}
+        missing = []
+        for key in {department.lower() for department in departments}:
+            snapshot = _summary_cache.get(key)
+            if snapshot is not None:
+                summaries[key] = DepartmentAISummaryCache(**snapshot)
+            else:
+                missing.append(key)
+
+        if not missing:
+            return summaries
+
         try:
             result = await self.db.execute(
                 select(DepartmentAISummaryCache).where(
-                    DepartmentAISummaryCache.department == department.lower()
+                    DepartmentAISummaryCache.department.in_(missing)
                 )
             )
-            return result.scalar_one_or_none()
         except Exception as e:
-            logger.error(f"Error getting cached summary for {department}: {e}")
-            return None
+            logger.error(f"Error getting cached summaries for {missing}: {e}")
+            return summaries
+
+        for cache in result.scalars().all():
+            _summary_cache[cache.department] = _snapshot(cache)
+            summaries[cache.department] = cache
+        return summaries
+
+    async def _load_summary(
+        self, department: str
+    ) -> Optional[DepartmentAISummaryCache]:
+        """Load the persistent summary row for a department from the database"""
+        department_key = department.lower()
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: select(DepartmentAISummaryCache).where(
+                    DepartmentAISummaryCache.department == department_key
+                )
+            )
+        )
+        return result.scalar_one_or_none()
 
     async def save_summary(
         self,
@@ -56,49 +129,45 @@ class DepartmentAICacheService:
         Returns:
             Updated cache entry
         """
-        try:
-            # Check if cache exists
-            cache = await self.get_cached_summary(department)
+        values = {
+            "consolidated_summary": summary_data.get("consolidated_summary"),
+            "key_patterns": summary_data.get("key_patterns", []),
+            "top_recommendations": summary_data.get("top_recommendations", []),
+            "department_insights": summary_data.get("department_insights"),
+            "severity_breakdown": summary_data.get("severity_breakdown", {}),
+            "total_lessons_analyzed": total_lessons,
+            "unique_commodities": summary_data.get("unique_commodities", 0),
+            "unique_suppliers": summary_data.get("unique_suppliers", 0),
+            "top_commodities": summary_data.get("top_commodities", []),
+            "top_suppliers": summary_data.get("top_suppliers", []),
+            "ai_generated": ai_generated,
+        }
 
-            if cache:
-                # Update existing cache
-                cache.consolidated_summary = summary_data.get("consolidated_summary")
-                cache.key_patterns = summary_data.get("key_patterns", [])
-                cache.top_recommendations = summary_data.get("top_recommendations", [])
-                cache.department_insights = summary_data.get("department_insights")
-                cache.severity_breakdown = summary_data.get("severity_breakdown", {})
-                cache.total_lessons_analyzed = total_lessons
-                cache.unique_commodities = summary_data.get("unique_commodities", 0)
-                cache.unique_suppliers = summary_data.get("unique_suppliers", 0)
-                cache.top_commodities = summary_data.get("top_commodities", [])
-                cache.top_suppliers = summary_data.get("top_suppliers", [])
-                cache.last_updated = datetime.utcnow()
-                cache.ai_generated = ai_generated
-
-                logger.info(f"Updated cache for department {department}")
-            else:
-                # Create new cache entry
-                cache = DepartmentAISummaryCache(
-                    department=department.lower(),
-                    consolidated_summary=summary_data.get("consolidated_summary"),
-                    key_patterns=summary_data.get("key_patterns", []),
-                    top_recommendations=summary_data.get("top_recommendations", []),
-                    department_insights=summary_data.get("department_insights"),
-                    severity_breakdown=summary_data.get("severity_breakdown", {}),
-                    total_lessons_analyzed=total_lessons,
-                    unique_commodities=summary_data.get("unique_commodities", 0),
-                    unique_suppliers=summary_data.get("unique_suppliers", 0),
-                    top_commodities=summary_data.get("top_commodities", []),
-                    top_suppliers=summary_data.get("top_suppliers", []),
-                    ai_generated=ai_generated,
-                )
-                self.db.add(cache)
+        try:
+            _summary_cache.pop(department.lower(), None)
 
-                logger.info(f"Created new cache for department {department}")
+            # Single-statement upsert keyed on the unique department column
+            insert = (
+                pg_insert
+                if self.db.bind.dialect.name == "postgresql"
+                else sqlite_insert
+            )
+            stmt = insert(DepartmentAISummaryCache).values(
+                department=department.lower(), **values
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DepartmentAISummaryCache.department],
+                # ON CONFLICT bypasses Column.onupdate, so bump it explicitly
+                set_={**values, "last_updated": func.now()},
+            ).returning(DepartmentAISummaryCache)
 
+            result = await self.db.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+            cache = result.one()
             await self.db.commit()
-            await self.db.refresh(cache)
 
+            logger.info(f"Saved cache for department {department}")
             return cache
 
         except Exception as e:
@@ -140,7 +209,8 @@ class DepartmentAICacheService:
             True if cache was deleted, False otherwise
         """
         try:
-            cache = await self.get_cached_summary(department)
+            _summary_cache.pop(department.lower(), None)
+            cache = await self._load_summary(department)
             if cache:
                 await self.db.delete(cache)
                 await self.db.commit()
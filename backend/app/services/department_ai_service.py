@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.openai_service import openai_service
 from app.services.department_ai_cache_service import DepartmentAICacheService
 from app.utils.database_utils import LessonLearnedRepository
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,7 +44,7 @@ class DepartmentAIService:
                     "key_patterns": [],
                     "top_recommendations": [],
                     "department_insights": f"No data available for {department} department analysis.",
-                    "generated_at": datetime.utcnow().isoformat(),
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
                     "ai_generated": False,
                     "from_cache": False,
                 }
@@ -77,7 +77,7 @@ class DepartmentAIService:
 
             # Generate AI-powered summary
             ai_summary = await self.openai_service.generate_department_summary(
-                department, lesson_summaries
+                department, lesson_summaries, use_cache=not force_regenerate
             )
 
             # Calculate severity breakdown
@@ -103,7 +103,7 @@ class DepartmentAIService:
                 "unique_suppliers": len(suppliers),
                 "top_commodities": commodities[:5],  # Top 5 commodities
                 "top_suppliers": suppliers[:5],  # Top 5 suppliers
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": datetime.now(timezone.utc).isoformat(),
                 "ai_generated": True,
                 "from_cache": False,
             }
@@ -149,7 +149,7 @@ class DepartmentAIService:
                         "Please try again later or contact support"
                     ],
                     "department_insights": f"Manual analysis required for {department} department due to AI service unavailability.",
-                    "generated_at": datetime.utcnow().isoformat(),
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
                     "ai_generated": False,
                     "from_cache": False,
                     "error": str(e),
@@ -191,14 +191,14 @@ class DepartmentAIService:
             )
 
             # Calculate additional metrics
-            recent_lessons = [
-                l for l in lessons if l.created_at.month == datetime.utcnow().month
-            ]
+            now = datetime.now(timezone.utc)
+            recent_lessons = [l for l in lessons if l.created_at.month == now.month]
             critical_lessons = [l for l in lessons if l.severity.value == "critical"]
             high_lessons = [l for l in lessons if l.severity.value == "high"]
 
             # Get trend data (last 6 months)
-            six_months_ago = datetime.utcnow().replace(day=1)
+            # created_at is stored naive (UTC), so compare against a naive value
+            six_months_ago = now.replace(day=1, tzinfo=None)
             recent_trend = [l for l in lessons if l.created_at >= six_months_ago]
 
             return {
@@ -229,7 +229,7 @@ class DepartmentAIService:
                     },
                 },
                 "ai_analysis_available": ai_summary.get("ai_generated", False),
-                "generated_at": datetime.utcnow().isoformat(),
+                "generated_at": datetime.now(timezone.utc).isoformat(),
             }
 
         except Exception as e:
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 import aiofiles
 from typing import List, Dict, Any, Optional
@@ -14,6 +15,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Uploads are streamed to disk in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Maximum number of files from one request written at the same time
+MAX_CONCURRENT_UPLOADS = 4
+
 
 class FileUploadService:
     """Service for handling file uploads and storage"""
@@ -108,22 +115,22 @@ class FileUploadService:
             unique_filename = self._generate_unique_filename(file.filename)
             file_path = self.upload_dir / unique_filename
 
-            # Read file content
-            content = await file.read()
-
-            # Check file size after reading
-            if len(content) > self.max_file_size:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File size {len(content)} exceeds maximum allowed size {self.max_file_size} bytes",
-                )
-
-            # Write file to disk
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(content)
-
-            # Get file size
-            file_size = len(content)
+            # Stream the file to disk in chunks, checking size as it arrives
+            file_size = 0
+            try:
+                async with aiofiles.open(file_path, "wb") as f:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        file_size += len(chunk)
+                        if file_size > self.max_file_size:
+                            raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"File size exceeds maximum allowed size {self.max_file_size} bytes",
+                            )
+                        await f.write(chunk)
+            except BaseException:
+                # Don't leave a partial file behind
+                file_path.unlink(missing_ok=True)
+                raise
 
             logger.info(
                 f"Successfully uploaded file: {unique_filename} ({file_size} bytes)"
@@ -168,24 +175,37 @@ class FileUploadService:
                     detail=f"Too many files. Maximum allowed: {max_files}",
                 )
 
+            # Upload files concurrently, a few at a time
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+            async def upload(file: UploadFile):
+                async with semaphore:
+                    return await self.upload_single_file(file)
+
+            outcomes = await asyncio.gather(
+                *(upload(file) for file in files), return_exceptions=True
+            )
+
             successful_uploads = []
             failed_uploads = []
 
-            for file in files:
-                try:
-                    upload_result = await self.upload_single_file(file)
-                    successful_uploads.append(upload_result)
-                except HTTPException as e:
+            for file, outcome in zip(files, outcomes):
+                if isinstance(outcome, HTTPException):
                     failed_uploads.append(
-                        {"filename": file.filename or "unknown", "error": e.detail}
+                        {
+                            "filename": file.filename or "unknown",
+                            "error": outcome.detail,
+                        }
                     )
-                except Exception as e:
+                elif isinstance(outcome, Exception):
                     failed_uploads.append(
                         {
                             "filename": file.filename or "unknown",
-                            "error": f"Unexpected error: {str(e)}",
+                            "error": f"Unexpected error: {str(outcome)}",
                         }
                     )
+                else:
+                    successful_uploads.append(outcome)
 
             return MultipleFileUploadResponse(
                 successful_uploads=successful_uploads,
@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Awaitable, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.openai_service import openai_service
 from app.schemas.ai_integration import OpenAIRequest, OpenAIResponse
 from app.schemas.lesson_learned import LessonLearnedCreate
 from app.models.lesson_learned import LessonLearned
 from app.utils.database_utils import LessonLearnedRepository
+from app.database import AsyncSessionLocal
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,32 +19,51 @@ class LessonAIService:
         self.repository = LessonLearnedRepository(db)
         self.openai_service = openai_service
 
+    async def create_lesson(self, lesson_data: LessonLearnedCreate) -> LessonLearned:
+        """
+        Create a lesson learned record without AI analysis
+
+        Args:
+            lesson_data: Lesson learned data
+
+        Returns:
+            LessonLearned: Created lesson
+        """
+        lesson_dict = lesson_data.model_dump()
+        # Normalize department name to lowercase for consistency
+        if "department" in lesson_dict:
+            lesson_dict["department"] = lesson_dict["department"].lower()
+        return await self.repository.create(lesson_dict)
+
     async def create_lesson_with_ai_analysis(
-        self, lesson_data: LessonLearnedCreate
+        self,
+        lesson_data: LessonLearnedCreate,
+        ai_analysis: Optional[Awaitable[OpenAIResponse]] = None,
     ) -> LessonLearned:
         """
         Create a lesson learned record with AI analysis
 
         Args:
             lesson_data: Lesson learned data
+            ai_analysis: Optional analysis of the lesson already in progress;
+                generated here when not given
 
         Returns:
             LessonLearned: Created lesson with AI analysis
         """
         try:
             # First, create the lesson without AI analysis
-            lesson_dict = lesson_data.model_dump()
-            # Normalize department name to lowercase for consistency
-            if "department" in lesson_dict:
-                lesson_dict["department"] = lesson_dict["department"].lower()
-            lesson = await self.repository.create(lesson_dict)
+            lesson = await self.create_lesson(lesson_data)
 
-            # Generate AI analysis
-            ai_analysis = await self._generate_ai_analysis(lesson_data)
+            # Generate AI analysis, or wait for the one already running
+            if ai_analysis is None:
+                analysis = await self.generate_ai_analysis(lesson_data)
+            else:
+                analysis = await ai_analysis
 
             # Update lesson with AI analysis
             updated_lesson = await self.repository.update(
-                lesson.id, {"ai_analysis": ai_analysis.model_dump()}
+                lesson.id, {"ai_analysis": analysis.model_dump()}
             )
 
             logger.info(f"Successfully created lesson {lesson.id} with AI analysis")
@@ -60,13 +80,14 @@ class LessonAIService:
             raise
 
     async def update_lesson_ai_analysis(
-        self, lesson_id: int
+        self, lesson_id: int, use_cache: bool = True
     ) -> Optional[LessonLearned]:
         """
         Update AI analysis for an existing lesson
 
         Args:
             lesson_id: ID of the lesson to update
+            use_cache: Reuse an earlier analysis of identical lesson data
 
         Returns:
             LessonLearned: Updated lesson with new AI analysis
@@ -93,7 +114,9 @@ class LessonAIService:
             )
 
             # Generate new AI analysis
-            ai_analysis = await self._generate_ai_analysis(lesson_data)
+            ai_analysis = await self.generate_ai_analysis(
+                lesson_data, use_cache=use_cache
+            )
 
             # Update lesson with new AI analysis
             updated_lesson = await self.repository.update(
@@ -107,14 +130,15 @@ class LessonAIService:
             logger.error(f"Failed to update AI analysis for lesson {lesson_id}: {e}")
             raise
 
-    async def _generate_ai_analysis(
-        self, lesson_data: LessonLearnedCreate
+    async def generate_ai_analysis(
+        self, lesson_data: LessonLearnedCreate, use_cache: bool = True
     ) -> OpenAIResponse:
         """
         Generate AI analysis for lesson data
 
         Args:
             lesson_data: Lesson learned data
+            use_cache: Reuse an earlier analysis of identical lesson data
 
         Returns:
             OpenAIResponse: AI analysis results
@@ -136,7 +160,7 @@ class LessonAIService:
 
             # Get AI analysis
             ai_analysis = await self.openai_service.analyze_lesson_learned(
-                openai_request
+                openai_request, use_cache=use_cache
             )
 
             return ai_analysis
@@ -174,3 +198,21 @@ class LessonAIService:
         except Exception as e:
             logger.error(f"Failed to get lesson with AI analysis {lesson_id}: {e}")
             raise
+
+
+async def generate_lesson_ai_analysis(lesson_id: int) -> None:
+    """
+    Background job that fills in AI analysis for a newly created lesson
+
+    Runs on its own session since the request's session is closed by the time
+    background tasks execute. Failures are logged and the lesson is left
+    without analysis, same as a failed inline analysis.
+
+    Args:
+        lesson_id: ID of the lesson to analyze
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            await LessonAIService(session).update_lesson_ai_analysis(lesson_id)
+    except Exception as e:
+        logger.warning(f"Lesson {lesson_id} left without AI analysis: {e}")
@@ -1,6 +1,10 @@
-import json
-from typing import List
+import asyncio
+import hashlib
+from typing import List, Optional, Type, TypeVar, Union
+import orjson
+from cachetools import LRUCache
 from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError
 from app.config import settings
 from app.schemas.ai_integration import (
     OpenAIRequest,
@@ -12,22 +16,124 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# Bump when a system prompt changes so cached completions of the old prompt
+# are no longer served
+PROMPT_VERSION = 1
+
+LESSON_ANALYSIS_SYSTEM_PROMPT = (
+    "You are an expert in quality management and continuous improvement. "
+    "Analyze quality issues and provide structured insights for manufacturing "
+    "processes. Always respond with valid JSON."
+)
+DEPARTMENT_SUMMARY_SYSTEM_PROMPT = (
+    "You are an expert in quality management and continuous improvement. "
+    "Analyze multiple lesson summaries from a department and provide "
+    "comprehensive insights. Always respond with valid JSON."
+)
+MAX_COMPLETION_TOKENS = 2048
+
 
 class OpenAIService:
     """Service for OpenAI API integration"""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key, max_retries=settings.openai_max_retries
+        )
         self.model = "gpt-4.1"  # Can be changed to gpt-4 for better results
+        # Validated completions keyed by a hash of everything sent to the model
+        self._response_cache: LRUCache = LRUCache(
+            maxsize=settings.openai_response_cache_size
+        )
+
+    def _completion_key(
+        self, system_prompt: str, prompt: str, temperature: float
+    ) -> str:
+        """Content address of a chat completion request"""
+        payload = orjson.dumps(
+            [
+                PROMPT_VERSION,
+                self.model,
+                system_prompt,
+                prompt,
+                temperature,
+                MAX_COMPLETION_TOKENS,
+            ]
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    async def _complete_json(
+        self,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        response_model: Type[ResponseT],
+        use_cache: bool = True,
+    ) -> ResponseT:
+        """
+        Run a JSON-mode chat completion, reusing the answer to an identical request
+
+        Args:
+            system_prompt: System message for the model
+            prompt: User message for the model
+            temperature: Sampling temperature
+            response_model: Schema the JSON answer is validated against
+            use_cache: Serve a previously cached answer if there is one; the
+                fresh answer is cached either way
+
+        Returns:
+            The model's answer validated as response_model
+
+        Raises:
+            Exception: If the API call fails or returns invalid JSON
+        """
+        key = self._completion_key(system_prompt, prompt, temperature)
+        if use_cache:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                logger.info("Serving OpenAI completion from cache")
+                return cached.model_copy(deep=True)
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=temperature,
+            max_tokens=MAX_COMPLETION_TOKENS,
+            response_format={"type": "json_object"},
+        )
+
+        # Parse the response
+        content = response.choices[0].message.content
+        if not content:
+            raise Exception("Empty response from OpenAI")
+
+        # Parse and validate the JSON response in one pass
+        try:
+            ai_response = response_model.model_validate_json(content)
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                logger.error(f"Failed to parse OpenAI JSON response: {e}")
+                logger.error(f"Raw response: {content}")
+                raise Exception(f"Invalid JSON response from OpenAI: {e}")
+            raise
+
+        self._response_cache[key] = ai_response
+        return ai_response.model_copy(deep=True)
 
     async def analyze_lesson_learned(
-        self, lesson_data: OpenAIRequest
+        self, lesson_data: OpenAIRequest, use_cache: bool = True
     ) -> OpenAIResponse:
         """
         Analyze a lesson learned and generate AI insights
 
         Args:
             lesson_data: Lesson learned data to analyze
+            use_cache: Reuse the analysis of an identical earlier request
 
         Returns:
             OpenAIResponse: AI analysis results
@@ -40,36 +146,14 @@ class OpenAIService:
             prompt = lesson_data.to_prompt_text()
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in quality management and continuous improvement. Analyze quality issues and provide structured insights for manufacturing processes. Always respond with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+            ai_response = await self._complete_json(
+                LESSON_ANALYSIS_SYSTEM_PROMPT,
+                prompt,
                 temperature=0.3,  # Lower temperature for more consistent results
-                max_tokens=2048,
-                response_format={"type": "json_object"},
+                response_model=OpenAIResponse,
+                use_cache=use_cache,
             )
 
-            # Parse the response
-            content = response.choices[0].message.content
-            if not content:
-                raise Exception("Empty response from OpenAI")
-
-            # Parse JSON response
-            try:
-                ai_data = json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse OpenAI JSON response: {e}")
-                logger.error(f"Raw response: {content}")
-                raise Exception(f"Invalid JSON response from OpenAI: {e}")
-
-            # Validate and create response
-            ai_response = OpenAIResponse(**ai_data)
-
             logger.info(
                 f"Successfully analyzed lesson for commodity: {lesson_data.commodity}"
             )
@@ -79,8 +163,33 @@ class OpenAIService:
             logger.error(f"OpenAI analysis failed: {e}")
             raise Exception(f"AI analysis failed: {str(e)}")
 
+    async def analyze_lessons_bulk(
+        self, lessons: List[OpenAIRequest], concurrency: Optional[int] = None
+    ) -> List[Union[OpenAIResponse, Exception]]:
+        """
+        Analyze several lessons learned concurrently
+
+        Args:
+            lessons: Lesson learned data to analyze
+            concurrency: Maximum requests in flight (defaults to
+                settings.openai_bulk_concurrency)
+
+        Returns:
+            AI analysis results in the order of lessons; a lesson whose analysis
+            failed gets its exception instead
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.openai_bulk_concurrency)
+
+        async def analyze(lesson: OpenAIRequest) -> OpenAIResponse:
+            async with semaphore:
+                return await self.analyze_lesson_learned(lesson)
+
+        return await asyncio.gather(
+            *(analyze(lesson) for lesson in lessons), return_exceptions=True
+        )
+
     async def generate_department_summary(
-        self, department: str, lesson_summaries: List[str]
+        self, department: str, lesson_summaries: List[str], use_cache: bool = True
     ) -> DepartmentSummaryResponse:
         """
         Generate a consolidated department summary from multiple lesson summaries
@@ -88,6 +197,7 @@ class OpenAIService:
         Args:
             department: Department name
             lesson_summaries: List of lesson summaries to analyze
+            use_cache: Reuse the summary of an identical earlier request
 
         Returns:
             DepartmentSummaryResponse: Consolidated department insights
@@ -105,36 +215,14 @@ class OpenAIService:
             prompt = summary_request.to_prompt_text()
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in quality management and continuous improvement. Analyze multiple lesson summaries from a department and provide comprehensive insights. Always respond with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+            ai_response = await self._complete_json(
+                DEPARTMENT_SUMMARY_SYSTEM_PROMPT,
+                prompt,
                 temperature=0.4,  # Slightly higher for more creative insights
-                max_tokens=2048,
-                response_format={"type": "json_object"},
+                response_model=DepartmentSummaryResponse,
+                use_cache=use_cache,
             )
 
-            # Parse the response
-            content = response.choices[0].message.content
-            if not content:
-                raise Exception("Empty response from OpenAI")
-
-            # Parse JSON response
-            try:
-                ai_data = json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse OpenAI JSON response: {e}")
-                logger.error(f"Raw response: {content}")
-                raise Exception(f"Invalid JSON response from OpenAI: {e}")
-
-            # Validate and create response
-            ai_response = DepartmentSummaryResponse(**ai_data)
-
             logger.info(f"Successfully generated department summary for: {department}")
             return ai_response
 
@@ -1,9 +1,21 @@
+import asyncio
+import hashlib
+import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache
 
-from app.schemas.solution_search import SearchResult, SearchSource
+from app.schemas.solution_search import RequestFeatures, SearchResult, SearchSource
+
+logger = logging.getLogger(__name__)
 
 try:
     from langchain_community.vectorstores import Chroma
@@ -14,12 +26,397 @@ except ImportError:
     LANGCHAIN_AVAILABLE = False
 
 try:
+    import numpy as np
     import pandas as pd
 
     PANDAS_AVAILABLE = True
 except ImportError:
     PANDAS_AVAILABLE = False
-    print("Warning: langchain not available. RAG search will use fallback text search.")
+    logger.warning("pandas not available. RAG text search is disabled.")
+
+try:
+    from rank_bm25 import BM25Okapi
+
+    BM25_AVAILABLE = True
+except ImportError:
+    BM25_AVAILABLE = False
+
+try:
+    import faiss
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Excel columns combined into each row's searchable text
+SEARCH_FIELDS = [
+    "Commodity",
+    "Teilenummer",
+    "Lieferant",
+    "Fehlerort",
+    "Fehlerart",
+    "Problembeschreibung",
+    "Auftreten Technisch",
+    "Auftreten Systemisch",
+    "Nicht-Entdecken Technisch",
+    "Nicht-Entdecken Systemisch",
+    "Maßnahme Auftreten Technisch",
+    "Maßnahme Auftreten Systemisch",
+    "Maßnahme Nicht-Entdecken Technisch",
+    "Maßnahme Nicht-Entdecken Systemisch",
+]
+
+# Shorter (normalized) queries return no results; matches the shortest term
+# TERM_PATTERN extracts, e.g. "qm"
+MIN_QUERY_LENGTH = 2
+
+# Query result cache bounds
+QUERY_CACHE_SIZE = 512
+QUERY_CACHE_TTL_SECONDS = 300
+
+# Query embeddings kept in memory; the rest are read back from disk
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+
+# Embedding micro-batching: requests arriving within the wait window share
+# a single embed_documents call
+EMBED_MAX_BATCH = 32
+EMBED_MAX_WAIT_SECONDS = 0.01
+
+# FAISS HNSW parameters for the in-process copy of the Chroma collection;
+# vectors are stored as int8 (SQ8), a quarter of the float32 footprint
+FAISS_HNSW_M = 32
+FAISS_EF_SEARCH = 64
+
+# Common stop words (English and German) dropped from search queries
+STOP_WORDS = frozenset(
+    {
+        "the",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "on",
+        "at",
+        "to",
+        "for",
+        "of",
+        "with",
+        "by",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "being",
+        "have",
+        "has",
+        "had",
+        "do",
+        "does",
+        "did",
+        "will",
+        "would",
+        "could",
+        "should",
+        "may",
+        "might",
+        "must",
+        "can",
+        "this",
+        "that",
+        "these",
+        "those",
+        "der",
+        "die",
+        "das",
+        "und",
+        "oder",
+        "aber",
+        "auf",
+        "zu",
+        "für",
+        "von",
+        "mit",
+        "durch",
+        "ist",
+        "sind",
+        "war",
+        "waren",
+        "sein",
+        "haben",
+        "hat",
+        "wird",
+        "würde",
+        "könnte",
+        "sollte",
+        "kann",
+        "muss",
+        "diese",
+        "diesen",
+    }
+)
+
+# Query words: letters only, minimum 2 characters for German
+TERM_PATTERN = re.compile(r"\b[a-zA-ZäöüßÄÖÜ]{2,}\b")
+
+# Words indexed per row for term matching
+TOKEN_PATTERN = re.compile(r"[a-zäöüß]{2,}")
+
+# Markdown knowledge base section markers
+DESCRIPTION_MARKERS = ("**Problembeschreibung**:", "**Fehlerort**")
+MASSNAHME_PATTERN = re.compile(r"\*\*(?:Maßnahme|Empfohlene Maßnahmen\*\*)")
+
+# Department keywords, checked in order against lowercased content
+DEPARTMENT_KEYWORDS = {
+    "engineering": ["engineering", "entwicklung", "technik"],
+    "quality": ["quality", "qualität", "qm"],
+    "production": ["production", "produktion", "fertigung"],
+    "supply chain": ["supply", "einkauf", "procurement"],
+    "it": ["it", "information", "system"],
+}
+DEPARTMENT_PATTERNS = {
+    dept: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    for dept, keywords in DEPARTMENT_KEYWORDS.items()
+}
+
+# Domain terms that boost a row when they appear in both the query and the row
+KEY_TERMS = ["ece", "marking", "label", "present", "missing", "fehlt", "richtlinie"]
+
+
+def _key_term_pattern(query_lower: str) -> Optional["re.Pattern"]:
+    """
+    Compile the key terms present in a query into a single alternation
+
+    Args:
+        query_lower: Lowercased query
+
+    Returns:
+        Compiled pattern, or None if the query contains no key terms
+    """
+    terms = [term for term in KEY_TERMS if term in query_lower]
+    if not terms:
+        return None
+    # Longest first so a term is never shadowed by a shorter prefix
+    terms.sort(key=len, reverse=True)
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+@lru_cache(maxsize=4096)
+def _parse_markdown(content: str) -> Tuple[str, str, Optional[str]]:
+    """
+    Parse markdown content to extract title, description, and solution
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        Tuple of (title, description, solution)
+    """
+    title = None
+    description = ""
+    solution = None
+    description_parts = []
+    solution_parts = []
+
+    # Single pass; each section moves from seeking to inside to done
+    seeking, inside, done = 0, 1, 2
+    description_state = solution_state = seeking
+
+    for raw_line in content.split("\n"):
+        # Title from first heading
+        if title is None and raw_line.startswith("# "):
+            title = raw_line[2:].strip()
+
+        line = raw_line.strip()
+
+        # Description from problem description or error context
+        if description_state != done:
+            if line.startswith(DESCRIPTION_MARKERS):
+                description_state = inside
+                description_parts.append(line)
+            elif description_state == inside:
+                if line.startswith("**"):
+                    description_state = done
+                elif line:
+                    description_parts.append(line)
+
+        # Solution from Maßnahmen section
+        if solution_state != done:
+            if MASSNAHME_PATTERN.search(line):
+                solution_state = inside
+                solution_parts.append(line)
+            elif solution_state == inside:
+                if line.startswith("**") and "Maßnahme" not in line:
+                    solution_state = done
+                elif line:
+                    solution_parts.append(line)
+
+        if title is not None and description_state == solution_state == done:
+            break
+
+    if description_parts:
+        description = " ".join(description_parts)[:300]
+
+    if solution_parts:
+        solution = " ".join(solution_parts)
+
+    if title is None:
+        title = "Knowledge Base Entry"
+
+    return title, description or "No description available", solution
+
+
+@lru_cache(maxsize=4096)
+def _department_for_content(content: str) -> Optional[str]:
+    """
+    Map content to the first department whose keywords it mentions
+
+    Args:
+        content: Markdown or row text
+
+    Returns:
+        Department name or None
+    """
+    content_lower = content.lower()
+    for dept, pattern in DEPARTMENT_PATTERNS.items():
+        if pattern.search(content_lower):
+            return dept
+    return None
+
+
+def _with_result_fields(
+    content: str, metadata: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Add the parsed title, description, solution and department to a document's
+    metadata, unless they were stored when the collection was built
+
+    Empty strings stand in for None, as Chroma metadata values can't be None.
+
+    Args:
+        content: Markdown content
+        metadata: Chroma metadata for the document
+
+    Returns:
+        Metadata including the result fields
+    """
+    metadata = dict(metadata or {})
+    if "title" not in metadata:
+        title, description, solution = _parse_markdown(content)
+        metadata["title"] = title
+        metadata["description"] = description
+        metadata["solution"] = solution or ""
+        metadata["department"] = _department_for_content(content) or ""
+    return metadata
+
+
+def _build_bm25_postings(
+    bm25: "BM25Okapi",
+) -> Dict[str, Tuple["np.ndarray", "np.ndarray"]]:
+    """
+    Flatten a BM25 index into per-term posting arrays
+
+    The BM25 weight of a term in a row depends only on the corpus, so it is
+    computed once here; scoring a query is then a scatter-add of each query
+    term's weights instead of a dict lookup per row and term.
+
+    Args:
+        bm25: Index built over the tokenized rows
+
+    Returns:
+        Mapping of term to (row positions, BM25 weights)
+    """
+    rows_by_term: Dict[str, List[int]] = {}
+    freqs_by_term: Dict[str, List[int]] = {}
+    for row, frequencies in enumerate(bm25.doc_freqs):
+        for term, freq in frequencies.items():
+            rows_by_term.setdefault(term, []).append(row)
+            freqs_by_term.setdefault(term, []).append(freq)
+
+    norm = bm25.k1 * (
+        1 - bm25.b + bm25.b * np.asarray(bm25.doc_len, dtype=float) / bm25.avgdl
+    )
+    postings = {}
+    for term, term_rows in rows_by_term.items():
+        rows = np.asarray(term_rows, dtype=np.int32)
+        freqs = np.asarray(freqs_by_term[term], dtype=float)
+        weights = bm25.idf[term] * freqs * (bm25.k1 + 1) / (freqs + norm[rows])
+        postings[term] = (rows, weights)
+    return postings
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched provider calls"""
+
+    def __init__(
+        self,
+        embed_documents: Callable[[List[str]], List[List[float]]],
+        executor: ThreadPoolExecutor,
+        max_batch: int = EMBED_MAX_BATCH,
+        max_wait_seconds: float = EMBED_MAX_WAIT_SECONDS,
+    ):
+        self._embed_documents = embed_documents
+        self._executor = executor
+        self._max_batch = max_batch
+        self._max_wait_seconds = max_wait_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Queue a text for embedding and wait for its vector
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue in batches of up to max_batch or max_wait_seconds"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_seconds
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(
+                    self._executor, self._embed_documents, texts
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
 
 
 class RAGSearchService:
@@ -35,33 +432,66 @@ class RAGSearchService:
         self.chroma_path = Path(chroma_path)
         self.excel_file = self.rag_directory / excel_file
         self.executor = ThreadPoolExecutor(max_workers=4)
-        self._cached_excel_data = {}
+        self._cached_excel_data = None
         self._cache_timestamp = None
+        self._excel_load_lock = asyncio.Lock()
+        # BM25 weights per term: (row positions, weights), built at Excel load
+        self._bm25_postings: Optional[Dict[str, Tuple[Any, Any]]] = None
         self._vector_db = None
         self._embeddings = None
 
+        # Query embeddings, in memory and persisted next to the Chroma index
+        self._embedding_cache: LRUCache = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        self._embedding_cache_path = self.chroma_path / "query_emb.sqlite"
+        self._embedding_cache_db: Optional[sqlite3.Connection] = None
+        self._embedding_cache_lock = threading.Lock()
+        self._embedding_batcher: Optional[EmbeddingBatcher] = None
+
+        # In-process FAISS copy of the Chroma collection, built on first search
+        self._faiss_index = None
+        self._faiss_docs: List[Tuple[str, Dict[str, Any]]] = []
+        self._faiss_space = "l2"
+        self._faiss_lock = asyncio.Lock()
+        self._faiss_failed = False
+
+        # LRU + TTL cache of search results keyed by
+        # (query, department, limit, min score)
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = threading.RLock()
+        self._query_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
         # Initialize vector database if langchain is available
         if LANGCHAIN_AVAILABLE:
             try:
                 self._embeddings = OpenAIEmbeddings()
+                self._embedding_batcher = EmbeddingBatcher(
+                    self._embeddings.embed_documents, self.executor
+                )
                 if self.chroma_path.exists():
                     self._vector_db = Chroma(
                         persist_directory=str(self.chroma_path),
                         embedding_function=self._embeddings,
                     )
-                    print(f"✅ Loaded ChromaDB from {self.chroma_path}")
+                    logger.info("Loaded ChromaDB from %s", self.chroma_path)
                 else:
-                    print(
-                        f"⚠️ ChromaDB not found at {self.chroma_path}. Using fallback text search."
+                    logger.warning(
+                        "ChromaDB not found at %s. Using fallback text search.",
+                        self.chroma_path,
                     )
             except Exception as e:
-                print(
-                    f"⚠️ Error initializing ChromaDB: {e}. Using fallback text search."
+                logger.warning(
+                    "Error initializing ChromaDB: %s. Using fallback text search.", e
                 )
                 self._vector_db = None
 
     async def search_excel_data(
-        self, query: str, department: Optional[str] = None, limit: int = 10
+        self,
+        query: str,
+        department: Optional[str] = None,
+        limit: int = 10,
+        min_relevance: float = 0.0,
+        precomputed: Optional[RequestFeatures] = None,
+        raise_errors: bool = False,
     ) -> List[SearchResult]:
         """
         Search through Excel data using vector similarity or text search
@@ -70,37 +500,126 @@ class RAGSearchService:
             query: Search query
             department: Optional department filter (ignored for universal knowledge base)
             limit: Maximum number of results
+            min_relevance: Minimum relevance score for returned results
+            precomputed: Optional query embedding computed once per request
+            raise_errors: Raise search failures instead of returning no results
 
         Returns:
             List of SearchResult objects
         """
+        # Normalize case and whitespace so trivial variations share a cache entry,
+        # and don't spend an embedding call on queries with nothing to match
+        query = self.normalize_query(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        # Neither backend returns anything under its own 0.3 floor
+        min_score = max(0.3, min_relevance)
+        cache_key = (query, department, limit, min_score)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            print(
-                f"🔍 RAG search called with query: '{query}', dept: '{department}', limit: {limit}"
+            logger.debug(
+                "RAG search called with query: %r, dept: %r, limit: %s",
+                query,
+                department,
+                limit,
             )
-            print(f"   Vector DB available: {self._vector_db is not None}")
-            print(f"   Pandas available: {PANDAS_AVAILABLE}")
 
             # Try vector search first if available
             if self._vector_db:
-                print("   → Using vector search")
-                results = await self._vector_search(query, limit)
-                print(f"   ← Vector search returned {len(results)} results")
-                return results
+                results = await self._vector_search(
+                    query,
+                    limit,
+                    min_score,
+                    precomputed.query_embedding if precomputed else None,
+                )
+                logger.debug("Vector search returned %d results", len(results))
             else:
                 # Fallback to text search
-                print("   → Using text search")
-                results = await self._text_search(query, department, limit)
-                print(f"   ← Text search returned {len(results)} results")
-                return results
+                results = await self._text_search(
+                    query, department, limit, min_score
+                )
+                logger.debug("Text search returned %d results", len(results))
 
-        except Exception as e:
-            print(f"❌ Error in RAG search: {e}")
-            import traceback
+            self._store_results(cache_key, results)
+            return results
 
-            traceback.print_exc()
+        except Exception as e:
+            logger.exception("Error in RAG search: %s", e)
+            if raise_errors:
+                raise
             return []
 
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse whitespace and lowercase a search query"""
+        return " ".join(query.split()).lower()
+
+    @property
+    def vector_search_enabled(self) -> bool:
+        """Whether searches go through the vector store"""
+        return self._vector_db is not None
+
+    async def embed_query(self, query: str) -> Optional[List[float]]:
+        """
+        Embed a query through the shared cache and batcher
+
+        Args:
+            query: Text to embed
+
+        Returns:
+            Query embedding, or None if embeddings are unavailable
+        """
+        if self._embedding_batcher is None:
+            return None
+        return await self._embed_query(query)
+
+    def _get_cached_results(self, key: Tuple) -> Optional[List[SearchResult]]:
+        """
+        Look up cached search results, dropping the entry if it has expired
+
+        Args:
+            key: (normalized query, department, limit, min score)
+
+        Returns:
+            Copy of the cached results, or None on a miss
+        """
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is not None:
+                stored_at, results = entry
+                if time.monotonic() - stored_at < QUERY_CACHE_TTL_SECONDS:
+                    self._query_cache.move_to_end(key)
+                    self._query_cache_stats["hits"] += 1
+                    return list(results)
+                del self._query_cache[key]
+
+            self._query_cache_stats["misses"] += 1
+            return None
+
+    def _store_results(self, key: Tuple, results: List[SearchResult]) -> None:
+        """
+        Cache search results, evicting the least recently used entry when full
+
+        Args:
+            key: (normalized query, department, limit, min score)
+            results: Search results to cache
+        """
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), list(results))
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+                self._query_cache_stats["evictions"] += 1
+
+    def _query_cache_info(self) -> Dict[str, int]:
+        """Snapshot of the query cache counters and current size"""
+        with self._query_cache_lock:
+            return {**self._query_cache_stats, "size": len(self._query_cache)}
+
     async def get_similar_cases(
         self, problem_description: str, department: Optional[str] = None, limit: int = 5
     ) -> List[SearchResult]:
@@ -120,7 +639,7 @@ class RAGSearchService:
             return await self.search_excel_data(problem_description, department, limit)
 
         except Exception as e:
-            print(f"Error finding similar cases: {e}")
+            logger.error("Error finding similar cases: %s", e)
             return []
 
     async def search_by_keywords(
@@ -146,7 +665,7 @@ class RAGSearchService:
             return await self.search_excel_data(query, department, limit)
 
         except Exception as e:
-            print(f"Error in keyword search: {e}")
+            logger.error("Error in keyword search: %s", e)
             return []
 
     async def get_knowledge_base_stats(self) -> Dict[str, Any]:
@@ -181,64 +700,103 @@ class RAGSearchService:
                 "files": file_info,
                 "rag_directory": str(self.rag_directory),
                 "chroma_available": self._vector_db is not None,
+                "query_cache": self._query_cache_info(),
             }
 
         except Exception as e:
-            print(f"Error getting knowledge base stats: {e}")
+            logger.error("Error getting knowledge base stats: %s", e)
             return {
                 "total_files": 0,
                 "total_documents": 0,
                 "files": [],
                 "rag_directory": str(self.rag_directory),
                 "chroma_available": False,
+                "query_cache": self._query_cache_info(),
             }
 
-    async def _vector_search(self, query: str, limit: int = 10) -> List[SearchResult]:
+    async def _vector_search(
+        self,
+        query: str,
+        limit: int = 10,
+        min_score: float = 0.3,
+        embedding: Optional[List[float]] = None,
+    ) -> List[SearchResult]:
         """
-        Perform vector similarity search using ChromaDB
+        Perform vector similarity search over the ChromaDB collection, through
+        its FAISS copy when faiss is installed
 
         Args:
             query: Search query
             limit: Maximum number of results
+            min_score: Minimum relevance score for returned results
+            embedding: Optional precomputed query embedding
 
         Returns:
             List of SearchResult objects
         """
         try:
-            # Perform similarity search with relevance scores
-            results = self._vector_db.similarity_search_with_relevance_scores(
-                query, k=limit
-            )
+            # Query the collection by vector so cached embeddings skip the API
+            if embedding is None:
+                embedding = await self._embed_query(query)
+            loop = asyncio.get_running_loop()
+            if await self._get_faiss_index() is not None:
+                results = await loop.run_in_executor(
+                    self.executor, self._faiss_query, embedding, limit
+                )
+            else:
+                results = await loop.run_in_executor(
+                    self.executor,
+                    lambda: self._vector_db._collection.query(
+                        query_embeddings=[embedding],
+                        n_results=limit,
+                        include=["metadatas", "documents", "distances"],
+                    ),
+                )
+            relevance_fn = self._vector_db._select_relevance_score_fn()
 
             search_results = []
-            for doc, score in results:
-                # Apply minimum relevance threshold
-                if score < 0.3:
-                    continue
+            for content, metadata, distance in zip(
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
+            ):
+                # Rounding (and SQ8 quantization) can push a near-exact hit's
+                # distance slightly below zero
+                score = min(relevance_fn(distance), 1.0)
+
+                # Apply minimum relevance threshold; hits come back nearest
+                # first, so everything after the first miss scores lower still
+                if score < min_score:
+                    break
 
                 # Extract metadata
-                metadata = doc.metadata
+                metadata = metadata or {}
                 source_file = metadata.get("source", "Unknown")
 
                 # Note: Department filter is ignored in RAG search as knowledge base is universal
 
-                # Extract title and description from content
-                title, description, solution = self._parse_markdown_content(
-                    doc.page_content
-                )
+                # Prefer fields precomputed at index time over parsing the content
+                if "title" in metadata:
+                    title = metadata["title"]
+                    description = metadata.get("description") or ""
+                    solution = metadata.get("solution") or None
+                    department = metadata.get("department") or None
+                else:
+                    title, description, solution = self._parse_markdown_content(
+                        content
+                    )
+                    department = self._extract_department_from_content(content)
 
                 search_result = SearchResult(
                     source=SearchSource.rag,
                     title=f"Knowledge Base: {title}",
-                    description=description,
+                    description=description or "No description available",
                     relevance_score=float(score),
                     solution=solution,
                     metadata={
                         "file_path": source_file,
                         "source_type": "markdown_knowledge_base",
-                        "department": self._extract_department_from_content(
-                            doc.page_content
-                        ),
+                        "department": department,
                     },
                 )
                 search_results.append(search_result)
@@ -246,11 +804,166 @@ class RAGSearchService:
             return search_results
 
         except Exception as e:
-            print(f"Error in vector search: {e}")
-            return []
+            logger.error("Error in vector search: %s", e)
+            raise
+
+    async def _get_faiss_index(self) -> Optional["faiss.Index"]:
+        """
+        Get the FAISS index, building it from ChromaDB on first use
+
+        Returns:
+            FAISS index, or None to query ChromaDB directly
+        """
+        if not FAISS_AVAILABLE or self._faiss_failed:
+            return None
+        if self._faiss_index is not None:
+            return self._faiss_index
+
+        async with self._faiss_lock:
+            if self._faiss_index is None and not self._faiss_failed:
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(self.executor, self._build_faiss_index)
+                    logger.info(
+                        "Built FAISS index with %d vectors", len(self._faiss_docs)
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Could not build FAISS index: %s. Querying ChromaDB.", e
+                    )
+                    self._faiss_failed = True
+
+        return self._faiss_index
+
+    def _build_faiss_index(self) -> None:
+        """Copy the Chroma collection into a quantized FAISS HNSW index (blocking)"""
+        collection = self._vector_db._collection
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        vectors = np.asarray(data["embeddings"], dtype=np.float32)
+        if len(vectors) == 0:
+            raise ValueError("ChromaDB collection is empty")
+
+        # Mirror the collection's distance so Chroma's relevance function applies
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+        metric = faiss.METRIC_L2 if space == "l2" else faiss.METRIC_INNER_PRODUCT
+        if space == "cosine":
+            faiss.normalize_L2(vectors)
+
+        index = faiss.IndexHNSWSQ(
+            vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, FAISS_HNSW_M, metric
+        )
+        index.hnsw.efSearch = FAISS_EF_SEARCH
+        index.train(vectors)
+        index.add(vectors)
+
+        self._faiss_docs = [
+            (document, _with_result_fields(document, metadata))
+            for document, metadata in zip(data["documents"], data["metadatas"])
+        ]
+        self._faiss_space = space
+        self._faiss_index = index
+
+    def _faiss_query(self, embedding: List[float], limit: int) -> Dict[str, Any]:
+        """
+        Search the FAISS index (blocking)
+
+        Args:
+            embedding: Query embedding
+            limit: Maximum number of results
+
+        Returns:
+            Results shaped like a Chroma collection query for a single embedding
+        """
+        query = np.asarray([embedding], dtype=np.float32)
+        if self._faiss_space == "cosine":
+            faiss.normalize_L2(query)
+
+        scores, ids = self._faiss_index.search(query, limit)
+
+        documents, metadatas, distances = [], [], []
+        for doc_id, score in zip(ids[0], scores[0]):
+            if doc_id < 0:
+                # Fewer vectors than requested
+                continue
+            document, metadata = self._faiss_docs[doc_id]
+            documents.append(document)
+            metadatas.append(metadata)
+            # FAISS L2 is squared like Chroma's; inner products become distances
+            distances.append(float(score) if self._faiss_space == "l2" else 1 - score)
+
+        return {
+            "documents": [documents],
+            "metadatas": [metadatas],
+            "distances": [distances],
+        }
+
+    async def _embed_query(self, query: str) -> List[float]:
+        """
+        Embed a query, reusing vectors cached in memory or on disk
+
+        Args:
+            query: Search query
+
+        Returns:
+            Query embedding
+        """
+        key = hashlib.sha256(query.strip().lower().encode()).digest()
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        loop = asyncio.get_running_loop()
+        embedding = await loop.run_in_executor(
+            self.executor, self._load_persisted_embedding, key
+        )
+        if embedding is None:
+            embedding = await self._embedding_batcher.embed(query)
+            await loop.run_in_executor(
+                self.executor, self._persist_embedding, key, embedding
+            )
+
+        self._embedding_cache[key] = embedding
+        return embedding
+
+    def _load_persisted_embedding(self, key: bytes) -> Optional[List[float]]:
+        """Look a query embedding up in the on-disk cache (blocking)"""
+        with self._embedding_cache_lock:
+            try:
+                if self._embedding_cache_db is None:
+                    self._embedding_cache_db = sqlite3.connect(
+                        self._embedding_cache_path, check_same_thread=False
+                    )
+                    self._embedding_cache_db.execute(
+                        "CREATE TABLE IF NOT EXISTS query_embeddings "
+                        "(hash BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+                    )
+                row = self._embedding_cache_db.execute(
+                    "SELECT vec FROM query_embeddings WHERE hash = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Query embedding cache unavailable: %s", e)
+                return None
+        return array("f", row[0]).tolist() if row is not None else None
+
+    def _persist_embedding(self, key: bytes, embedding: List[float]) -> None:
+        """Write a query embedding to the on-disk cache (blocking)"""
+        with self._embedding_cache_lock:
+            try:
+                if self._embedding_cache_db is not None:
+                    self._embedding_cache_db.execute(
+                        "INSERT OR REPLACE INTO query_embeddings VALUES (?, ?)",
+                        (key, array("f", embedding).tobytes()),
+                    )
+                    self._embedding_cache_db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Could not persist query embedding: %s", e)
 
     async def _text_search(
-        self, query: str, department: Optional[str] = None, limit: int = 10
+        self,
+        query: str,
+        department: Optional[str] = None,
+        limit: int = 10,
+        min_score: float = 0.3,
     ) -> List[SearchResult]:
         """
         Perform fallback text search through Excel data
@@ -259,115 +972,278 @@ class RAGSearchService:
             query: Search query
             department: Optional department filter (ignored for universal knowledge base)
             limit: Maximum number of results
+            min_score: Minimum relevance score for returned results
 
         Returns:
             List of SearchResult objects
         """
         try:
             # Load Excel data
-            excel_data = await self._load_excel_data()
+            df = await self._load_excel_data()
 
-            if not excel_data:
+            if df is None or df.empty:
                 return []
 
-            search_results = []
-            query_lower = query.lower()
             search_terms = self._extract_search_terms(query)
+            if self._bm25_postings is not None:
+                scores = self._bm25_scores(search_terms, len(df))
+            else:
+                scores = self._score_rows(df, query.lower(), search_terms)
 
-            for row_index, row_data in excel_data.items():
-                # Convert row data to searchable text
-                content = self._row_to_searchable_text(row_data)
+            # Minimum relevance threshold; stable sort keeps row order on ties
+            matched = np.flatnonzero(scores >= min_score)
+            if len(matched) > limit:
+                top = np.argpartition(-scores[matched], limit - 1)[:limit]
+                matched = np.sort(matched[top])
+            matched = matched[np.argsort(-scores[matched], kind="stable")][:limit]
 
-                relevance_score = self._calculate_text_similarity(
-                    content, query_lower, search_terms, department
-                )
+            if len(matched) == 0:
+                return []
 
-                if relevance_score >= 0.3:  # Minimum relevance threshold
-                    title, description, solution = self._parse_excel_row(row_data)
-
-                    search_result = SearchResult(
-                        source=SearchSource.rag,
-                        title=f"Knowledge Base: {title}",
-                        description=description,
-                        relevance_score=relevance_score,
-                        solution=solution,
-                        metadata={
-                            "row_index": row_index,
-                            "source_type": "excel_knowledge_base",
-                            "department": self._extract_department_from_row(row_data),
-                        },
-                    )
-                    search_results.append(search_result)
+            # Result fields were parsed at load; read just those for the matches
+            rows = (
+                df[["_title", "_description", "_solution", "_dept"]]
+                .take(matched)
+                .to_numpy(dtype=object)
+                .tolist()
+            )
+            search_results = []
+            for position, (title, description, solution, dept) in zip(matched, rows):
+                search_result = SearchResult(
+                    source=SearchSource.rag,
+                    title=f"Knowledge Base: {title}",
+                    description=description,
+                    relevance_score=float(scores[position]),
+                    solution=solution or None,
+                    metadata={
+                        "row_index": int(df.index[position]),
+                        "source_type": "excel_knowledge_base",
+                        "department": dept or None,
+                    },
+                )
+                search_results.append(search_result)
 
-            # Sort by relevance and limit results
-            search_results.sort(key=lambda x: x.relevance_score, reverse=True)
-            return search_results[:limit]
+            return search_results
 
         except Exception as e:
-            print(f"Error in text search: {e}")
-            return []
+            logger.error("Error in text search: %s", e)
+            raise
+
+    def _bm25_scores(self, search_terms: List[str], row_count: int) -> "np.ndarray":
+        """
+        Score every row against the BM25 postings built at load time
+
+        Args:
+            search_terms: Extracted (unique) search terms
+            row_count: Number of rows in the loaded sheet
+
+        Returns:
+            Array of BM25 scores normalized to 0.0-1.0, one per row
+        """
+        scores = np.zeros(row_count)
+        for term in search_terms:
+            posting = self._bm25_postings.get(term)
+            if posting is not None:
+                rows, weights = posting
+                scores[rows] += weights
+
+        best = scores.max(initial=0.0)
+        if best <= 0:
+            return np.zeros_like(scores)
+        return np.maximum(scores, 0) / best
+
+    def _score_rows(
+        self, df: "pd.DataFrame", query_lower: str, search_terms: List[str]
+    ) -> "np.ndarray":
+        """
+        Score every row on direct query, key term and term matches plus entry
+        length; used when rank_bm25 is not installed
+
+        Args:
+            df: Loaded Excel data with "_search" and "_tokens" columns
+            query_lower: Lowercased query
+            search_terms: Extracted search terms
+
+        Returns:
+            Array of similarity scores between 0.0 and 1.0, one per row
+        """
+        searchable = df["_search"]
+        scores = np.zeros(len(df))
+
+        # Direct query matching (highest priority)
+        scores += 0.8 * searchable.str.contains(query_lower, regex=False).to_numpy()
+
+        # Check for key terms from the query: one alternation pass over all
+        # rows, then count distinct terms only on the rows that matched
+        key_pattern = _key_term_pattern(query_lower)
+        if key_pattern is not None:
+            candidates = np.flatnonzero(
+                searchable.str.contains(key_pattern, regex=True).to_numpy()
+            )
+            for position in candidates:
+                scores[position] += 0.3 * len(
+                    set(key_pattern.findall(searchable.iat[position]))
+                )
+
+        # Term matches (0.4) plus the phrase boost (0.2); every search term comes
+        # from the query, so both count the same matches
+        if search_terms:
+            terms = frozenset(search_terms)
+            matches = np.fromiter(
+                (len(tokens & terms) for tokens in df["_tokens"]),
+                dtype=float,
+                count=len(df),
+            )
+            scores += matches / len(search_terms) * 0.6
+
+        # Boost score for longer, more detailed entries
+        scores += np.minimum(searchable.str.len().to_numpy() / 1000, 0.1)
+
+        # Cap the score at 1.0
+        return np.minimum(scores, 1.0)
 
-    async def _load_excel_data(self) -> Dict[int, Dict[str, Any]]:
+    async def _load_excel_data(self) -> Optional["pd.DataFrame"]:
         """
         Load Excel data from RAG directory
 
         Returns:
-            Dictionary mapping row indices to row data dictionaries
+            DataFrame of the sheet with empty strings for missing cells plus
+            precomputed lowercased "_search" text, parsed "_title",
+            "_description", "_solution" and "_dept" result fields (and
+            "_tokens" word sets when there is no BM25 index), or None if
+            unavailable
         """
         try:
             if not PANDAS_AVAILABLE:
-                print("Pandas not available. Cannot load Excel data.")
-                return {}
+                logger.warning("Pandas not available. Cannot load Excel data.")
+                return None
 
             # Check if we need to reload data (cache for 5 minutes)
-            import time
-
-            current_time = time.time()
-            if (
-                self._cached_excel_data
-                and self._cache_timestamp
-                and (current_time - self._cache_timestamp) < 300
-            ):
+            if self._excel_cache_fresh():
                 return self._cached_excel_data
 
-            excel_data = {}
+            async with self._excel_load_lock:
+                # Another request may have finished loading while we waited
+                if self._excel_cache_fresh():
+                    return self._cached_excel_data
+
+                if not self.excel_file.exists():
+                    logger.warning("Excel file does not exist: %s", self.excel_file)
+                    return None
+
+                # Parsing and indexing are blocking; keep them off the event loop
+                current_time = time.time()
+                loop = asyncio.get_running_loop()
+                try:
+                    df, postings = await loop.run_in_executor(
+                        self.executor, self._build_excel_index
+                    )
+
+                    logger.info("Processed %d rows from Excel file", len(df))
 
-            if not self.excel_file.exists():
-                print(f"Excel file does not exist: {self.excel_file}")
-                return excel_data
+                except Exception as e:
+                    logger.error("Error reading Excel file: %s", e)
+                    return None
 
-            # Load Excel file
-            try:
-                df = pd.read_excel(self.excel_file)
-                print(f"Loaded Excel file with {len(df)} rows")
+                # Cache the data
+                self._cached_excel_data = df
+                self._bm25_postings = postings
+                self._cache_timestamp = current_time
 
-                # Process each row (skip header, so start from index 0)
-                for index, row in df.iterrows():
-                    # Convert row to dictionary, handling NaN values
-                    row_dict = {}
-                    for col, value in row.items():
-                        if pd.isna(value):
-                            row_dict[col] = ""
-                        else:
-                            row_dict[col] = str(value)
+                return df
 
-                    excel_data[index] = row_dict
+        except Exception as e:
+            logger.error("Error loading Excel data: %s", e)
+            return None
+
+    def _excel_cache_fresh(self) -> bool:
+        """Whether the loaded Excel data is younger than five minutes"""
+        return (
+            self._cached_excel_data is not None
+            and self._cache_timestamp is not None
+            and (time.time() - self._cache_timestamp) < 300
+        )
+
+    def _build_excel_index(
+        self,
+    ) -> Tuple["pd.DataFrame", Optional[Dict[str, Tuple[Any, Any]]]]:
+        """
+        Read the Excel sheet and build its search index (blocking)
 
-                print(f"Processed {len(excel_data)} rows from Excel file")
+        Returns:
+            Tuple of (DataFrame, BM25 postings or None without rank_bm25)
+        """
+        # Load Excel file, preferring the parquet cache when it's current
+        df = self._read_excel_frame()
+
+        # Result fields depend only on the row, so parse them once here ("" for
+        # None; str columns can't hold None)
+        parsed = [self._parse_excel_row(row) for row in df.to_dict("records")]
+        df["_title"] = [title for title, _, _ in parsed]
+        df["_description"] = [description for _, description, _ in parsed]
+        df["_solution"] = [solution or "" for _, _, solution in parsed]
+        df["_dept"] = df["_search"].map(
+            lambda text: _department_for_content(text) or ""
+        )
+
+        if BM25_AVAILABLE:
+            postings = _build_bm25_postings(
+                BM25Okapi(df["_search"].map(TOKEN_PATTERN.findall).tolist())
+            )
+        else:
+            postings = None
+            df["_tokens"] = df["_search"].map(
+                lambda text: frozenset(TOKEN_PATTERN.findall(text))
+            )
+        return df, postings
 
+    def _read_excel_frame(self) -> "pd.DataFrame":
+        """
+        Read the Excel sheet with string cells and its "_search" column
+
+        Parsing xlsx with openpyxl is slow, so the processed frame is kept in a
+        sibling .parquet file and reused until the xlsx is modified again.
+
+        Returns:
+            DataFrame with empty strings for missing cells and "_search" text
+        """
+        cache_path = self.excel_file.with_suffix(".parquet")
+        if (
+            cache_path.exists()
+            and cache_path.stat().st_mtime >= self.excel_file.stat().st_mtime
+        ):
+            try:
+                return pd.read_parquet(cache_path)
             except Exception as e:
-                print(f"Error reading Excel file: {e}")
-                return {}
+                logger.warning("Ignoring unreadable Excel cache %s: %s", cache_path, e)
+
+        df = pd.read_excel(self.excel_file)
+        logger.info("Loaded Excel file with %d rows", len(df))
 
-            # Cache the data
-            self._cached_excel_data = excel_data
-            self._cache_timestamp = current_time
+        # Convert cells to strings, handling NaN values
+        df = df.astype(str).where(df.notna(), "")
 
-            return excel_data
+        # Precompute the searchable text once instead of per query: non-empty
+        # fields joined by single spaces, built column by column
+        search = pd.Series("", index=df.index, dtype="str")
+        for field in SEARCH_FIELDS:
+            if field in df.columns:
+                search += (" " + df[field]).where(df[field] != "", "")
+        df["_search"] = search.str[1:].str.lower()
 
+        # Dictionary-encode repetitive columns (Commodity, Fehlerort, the
+        # Maßnahme fields, ...); the parquet cache keeps the encoding
+        for column in df.columns.drop("_search"):
+            if df[column].nunique() <= len(df) // 2:
+                df[column] = df[column].astype("category")
+
+        try:
+            df.to_parquet(cache_path)
         except Exception as e:
-            print(f"Error loading Excel data: {e}")
-            return {}
+            # e.g. no parquet engine installed; just parse the xlsx next time
+            logger.warning("Could not write Excel cache %s: %s", cache_path, e)
+
+        return df
 
     def _extract_search_terms(self, query: str) -> List[str]:
         """
@@ -379,155 +1255,14 @@ class RAGSearchService:
         Returns:
             List of search terms
         """
-        # Remove common stop words (English and German)
-        stop_words = {
-            "the",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "on",
-            "at",
-            "to",
-            "for",
-            "of",
-            "with",
-            "by",
-            "is",
-            "are",
-            "was",
-            "were",
-            "be",
-            "been",
-            "being",
-            "have",
-            "has",
-            "had",
-            "do",
-            "does",
-            "did",
-            "will",
-            "would",
-            "could",
-            "should",
-            "may",
-            "might",
-            "must",
-            "can",
-            "this",
-            "that",
-            "these",
-            "those",
-            "der",
-            "die",
-            "das",
-            "und",
-            "oder",
-            "aber",
-            "in",
-            "auf",
-            "an",
-            "zu",
-            "für",
-            "von",
-            "mit",
-            "durch",
-            "ist",
-            "sind",
-            "war",
-            "waren",
-            "sein",
-            "haben",
-            "hat",
-            "wird",
-            "würde",
-            "könnte",
-            "sollte",
-            "kann",
-            "muss",
-            "diese",
-            "diesen",
-        }
-
         # Extract words (alphanumeric only, minimum 2 characters for German)
-        words = re.findall(r"\b[a-zA-ZäöüßÄÖÜ]{2,}\b", query.lower())
+        words = TERM_PATTERN.findall(query.lower())
 
         # Filter out stop words and get unique terms
-        search_terms = list(set([word for word in words if word not in stop_words]))
+        search_terms = list({word for word in words if word not in STOP_WORDS})
 
         return search_terms[:10]  # Limit to 10 terms
 
-    def _calculate_text_similarity(
-        self,
-        content: str,
-        query: str,
-        search_terms: List[str],
-        department: Optional[str] = None,
-    ) -> float:
-        """
-        Calculate text similarity score for markdown content
-
-        Args:
-            content: Markdown content
-            query: Original query
-            search_terms: Extracted search terms
-            department: Optional department filter
-
-        Returns:
-            Similarity score between 0.0 and 1.0
-        """
-        score = 0.0
-        content_lower = content.lower()
-        query_lower = query.lower()
-
-        # Note: Department filter is ignored in RAG search as knowledge base is universal
-
-        # Direct query matching (highest priority)
-        if query_lower in content_lower:
-            score += 0.8
-
-        # Check for key terms from the query
-        key_terms = [
-            "ece",
-            "marking",
-            "label",
-            "present",
-            "missing",
-            "fehlt",
-            "richtlinie",
-        ]
-        for term in key_terms:
-            if term in query_lower and term in content_lower:
-                score += 0.3
-
-        # Text similarity based on search terms
-        if search_terms:
-            # Count term matches
-            matches = sum(1 for term in search_terms if term in content_lower)
-            if matches > 0:
-                term_score = matches / len(search_terms)
-                score += term_score * 0.4
-
-            # Boost score for exact phrase matches
-            phrase_matches = sum(
-                1
-                for term in search_terms
-                if term in query_lower and term in content_lower
-            )
-            if phrase_matches > 0:
-                phrase_boost = phrase_matches / len(search_terms) * 0.2
-                score += phrase_boost
-
-        # Boost score for longer, more detailed entries
-        content_length = len(content)
-        length_boost = min(content_length / 1000, 0.1)  # Normalize to 1000 chars
-        score += length_boost
-
-        # Cap the score at 1.0
-        return min(score, 1.0)
-
     def _parse_markdown_content(self, content: str) -> Tuple[str, str, Optional[str]]:
         """
         Parse markdown content to extract title, description, and solution
@@ -538,54 +1273,7 @@ class RAGSearchService:
         Returns:
             Tuple of (title, description, solution)
         """
-        lines = content.split("\n")
-        title = "Knowledge Base Entry"
-        description = ""
-        solution = None
-
-        # Extract title from first heading
-        for line in lines:
-            if line.startswith("# "):
-                title = line[2:].strip()
-                break
-
-        # Extract description from problem description or error context
-        in_description = False
-        description_parts = []
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("**Problembeschreibung**:") or line.startswith(
-                "**Fehlerort**"
-            ):
-                in_description = True
-                description_parts.append(line)
-            elif line.startswith("**") and in_description:
-                break
-            elif in_description and line:
-                description_parts.append(line)
-
-        if description_parts:
-            description = " ".join(description_parts)[:300]
-
-        # Extract solution from Maßnahmen section
-        in_solution = False
-        solution_parts = []
-
-        for line in lines:
-            line = line.strip()
-            if "**Maßnahme" in line or "**Empfohlene Maßnahmen**" in line:
-                in_solution = True
-                solution_parts.append(line)
-            elif line.startswith("**") and in_solution and "Maßnahme" not in line:
-                break
-            elif in_solution and line:
-                solution_parts.append(line)
-
-        if solution_parts:
-            solution = " ".join(solution_parts)
-
-        return title, description or "No description available", solution
+        return _parse_markdown(content)
 
     def _extract_department_from_content(self, content: str) -> Optional[str]:
         """
@@ -597,60 +1285,7 @@ class RAGSearchService:
         Returns:
             Department name or None
         """
-        # Look for department-related keywords in the content
-        content_lower = content.lower()
-
-        # Common department keywords
-        dept_keywords = {
-            "engineering": ["engineering", "entwicklung", "technik"],
-            "quality": ["quality", "qualität", "qm"],
-            "production": ["production", "produktion", "fertigung"],
-            "supply chain": ["supply", "einkauf", "procurement"],
-            "it": ["it", "information", "system"],
-        }
-
-        for dept, keywords in dept_keywords.items():
-            if any(keyword in content_lower for keyword in keywords):
-                return dept
-
-        return None
-
-    def _row_to_searchable_text(self, row_data: Dict[str, Any]) -> str:
-        """
-        Convert Excel row data to searchable text
-
-        Args:
-            row_data: Dictionary containing row data
-
-        Returns:
-            Combined text from all relevant fields
-        """
-        # Combine all text fields for searching
-        text_parts = []
-
-        # Key fields to include in search
-        key_fields = [
-            "Commodity",
-            "Teilenummer",
-            "Lieferant",
-            "Fehlerort",
-            "Fehlerart",
-            "Problembeschreibung",
-            "Auftreten Technisch",
-            "Auftreten Systemisch",
-            "Nicht-Entdecken Technisch",
-            "Nicht-Entdecken Systemisch",
-            "Maßnahme Auftreten Technisch",
-            "Maßnahme Auftreten Systemisch",
-            "Maßnahme Nicht-Entdecken Technisch",
-            "Maßnahme Nicht-Entdecken Systemisch",
-        ]
-
-        for field in key_fields:
-            if field in row_data and row_data[field]:
-                text_parts.append(str(row_data[field]))
-
-        return " ".join(text_parts)
+        return _department_for_content(content)
 
     def _parse_excel_row(self, row_data: Dict[str, Any]) -> Tuple[str, str, str]:
         """
@@ -694,17 +1329,3 @@ class RAGSearchService:
         solution = " | ".join(solution_parts) if solution_parts else None
 
         return title, description, solution
-
-    def _extract_department_from_row(self, row_data: Dict[str, Any]) -> Optional[str]:
-        """
-        Extract department from Excel row data
-
-        Args:
-            row_data: Dictionary containing row data
-
-        Returns:
-            Department name or None
-        """
-        # Combine all text from the row
-        all_text = self._row_to_searchable_text(row_data)
-        return self._extract_department_from_content(all_text)
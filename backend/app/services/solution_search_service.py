@@ -1,26 +1,150 @@
-from typing import List, Dict, Any
-from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import hashlib
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+
+import orjson
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.schemas.solution_search import (
+    RequestFeatures,
     SolutionSearchRequest,
     SearchResult,
     SearchStatus,
 )
+from app.database import AsyncSessionLocal
 from app.models.solution_search import SolutionSearch, SearchResultCache
-from app.services.database_search_service import DatabaseSearchService
+from app.services.database_search_service import (
+    DatabaseSearchService,
+    clear_semantic_query_cache,
+)
 from app.services.rag_search_service import RAGSearchService
 from app.services.web_search_service import WebSearchService
 
+logger = logging.getLogger(__name__)
+
+# Per-process cache of completed search outcomes keyed by a hash of the
+# normalized request, so repeated searches skip all three backends
+_search_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
+
+# Progress is only polled, so intermediate writes closer together than this
+# are skipped; the final results update always carries the full progress
+PROGRESS_WRITE_INTERVAL_SECONDS = 0.25
+
+# Each backend filters by the request's minimum relevance and returns at most
+# this many results, best first
+MAX_RESULTS_PER_SOURCE = {"database": 8, "rag": 6, "web": 4}
+
+# Order sources are trusted in; a result that several sources return is kept
+# only in the first
+SOURCE_PRIORITY = ("database", "rag", "web")
+
+# Confidence weight of each source: internal data first, then the knowledge
+# base, then external sources
+SOURCE_WEIGHTS = (("database", 0.5), ("rag", 0.3), ("web", 0.2))
+
+
+def _fingerprint(result: SearchResult) -> str:
+    """Identify a result by its URL, or by title and opening description"""
+    key = result.url or result.title + result.description[:64]
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _summary_text(
+    db_count: int, rag_count: int, web_count: int, severity: str, department: str
+) -> str:
+    """Build the search summary, which only depends on counts and request fields"""
+    total_results = db_count + rag_count + web_count
+
+    if total_results == 0:
+        return f"No relevant solutions found for your {severity} severity issue in {department} department. Consider refining your search criteria or consulting with domain experts."
+
+    # Create summary based on results
+    summary_parts = []
+
+    # Database results summary
+    if db_count:
+        summary_parts.append(
+            f"Found {db_count} similar incidents in our internal database with proven solutions."
+        )
+
+    # RAG results summary
+    if rag_count:
+        summary_parts.append(
+            f"Located {rag_count} relevant entries in our knowledge base."
+        )
+
+    # Web results summary
+    if web_count:
+        summary_parts.append(
+            f"Identified {web_count} industry best practices and external solutions."
+        )
+
+    # Combine summary parts
+    base_summary = f"Search completed for your {severity} severity issue in {department} department. "
+    base_summary += " ".join(summary_parts)
+
+    # Add confidence indicator
+    if total_results >= 5:
+        base_summary += " High confidence in the provided solutions."
+    elif total_results >= 2:
+        base_summary += " Moderate confidence in the provided solutions."
+    else:
+        base_summary += " Limited results available - consider additional research."
+
+    return base_summary
+
+
+def invalidate_search_cache() -> None:
+    """Forget cached search outcomes after lessons were created, edited or deleted"""
+    _search_cache.clear()
+    clear_semantic_query_cache()
+
+
+def _request_cache_key(search_request: SolutionSearchRequest) -> str:
+    """Hash the parts of a search request that determine its results"""
+    canonical = {
+        "problem_description": " ".join(
+            search_request.problem_description.split()
+        ).lower(),
+        "department": search_request.department.strip(),
+        "severity": search_request.severity.value,
+        "keywords": sorted(
+            {keyword.strip().lower() for keyword in search_request.keywords}
+        ),
+        "search_sources": sorted(
+            source.value for source in search_request.search_sources
+        ),
+        "min_relevance_score": search_request.min_relevance_score,
+    }
+    return hashlib.sha256(
+        orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+
 
 class SolutionSearchService:
     """Master service for coordinating solution searches across all sources"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        rag_service: Optional[RAGSearchService] = None,
+        web_service: Optional[WebSearchService] = None,
+        sessionmaker: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ):
         self.db = db
-        self.database_service = DatabaseSearchService(db)
-        self.rag_service = RAGSearchService()
-        self.web_service = WebSearchService()
+        # Work that runs while the searches are in flight takes its own session;
+        # an AsyncSession can't be shared between concurrent tasks
+        self._sessionmaker = sessionmaker
+        self._last_progress_write = 0.0
+        # The app shares one RAG and web service across requests so their
+        # caches, indexes and clients persist; build new ones only when none
+        # are given
+        self.rag_service = rag_service or RAGSearchService()
+        self.web_service = web_service or WebSearchService()
 
     async def perform_comprehensive_search(
         self, search_request: SolutionSearchRequest, search_id: int
@@ -36,8 +160,31 @@ class SolutionSearchService:
             Dictionary with search results and metadata
         """
         try:
-            # Update search status to searching
-            await self._update_search_status(search_id, SearchStatus.searching)
+            # Reuse the outcome of an identical recent search
+            cache_key = _request_cache_key(search_request)
+            cached = _search_cache.get(cache_key)
+            if cached is not None:
+                await self._cache_search_results(
+                    search_id, cached["serialized_results"]
+                )
+                await self._update_search_results(
+                    search_id,
+                    cached["final_results"],
+                    cached["summary"],
+                    cached["confidence_score"],
+                    cached["progress"],
+                )
+                return {
+                    "search_id": search_id,
+                    "results": cached["results"],
+                    "summary": cached["summary"],
+                    "confidence_score": cached["confidence_score"],
+                    "errors": {},
+                    "progress": cached["progress"],
+                }
+
+            # Searches are created with status "searching", so there's no
+            # status to write yet
 
             # Initialize progress tracking
             progress = {
@@ -51,17 +198,20 @@ class SolutionSearchService:
             all_results = {}
             search_errors = {}
 
+            # Tokenize and embed the request once for all backends
+            features = await self._compute_features(search_request)
+
             # Run searches in parallel for better performance
             search_tasks = []
 
             # Database search
             if "database" in search_request.search_sources:
-                task = self._run_database_search(search_request, search_id)
+                task = self._run_database_search(search_request, search_id, features)
                 search_tasks.append(("database", task))
 
             # RAG search
             if "rag" in search_request.search_sources:
-                task = self._run_rag_search(search_request, search_id)
+                task = self._run_rag_search(search_request, search_id, features)
                 search_tasks.append(("rag", task))
 
             # Web search
@@ -69,29 +219,39 @@ class SolutionSearchService:
                 task = self._run_web_search(search_request, search_id)
                 search_tasks.append(("web", task))
 
-            # Execute searches with progress tracking
-            for source_name, task in search_tasks:
+            # Execute searches concurrently, tracking progress as each finishes
+            async def track(source_name, task):
                 try:
-                    results = await task
-                    all_results[source_name] = results
-                    progress[f"{source_name}_completed"] = True
-                    progress["completed_sources"] += 1
-
-                    # Update progress in database
-                    await self._update_search_progress(search_id, progress)
-
+                    all_results[source_name] = await task
                 except Exception as e:
-                    print(f"Error in {source_name} search: {e}")
+                    logger.exception(f"Error in {source_name} search: {e}")
                     search_errors[source_name] = str(e)
-                    progress[f"{source_name}_completed"] = True
-                    progress["completed_sources"] += 1
-                    await self._update_search_progress(search_id, progress)
+
+                progress[f"{source_name}_completed"] = True
+                progress["completed_sources"] += 1
+
+                # Update progress in database
+                await self._update_search_progress(search_id, progress)
+
+            await asyncio.gather(
+                *(track(source_name, task) for source_name, task in search_tasks)
+            )
 
             # Rank and filter results
             ranked_results = await self.rank_and_filter_results(
                 all_results, search_request, search_id
             )
 
+            # Serialize each result once for both the cache rows and the
+            # final results
+            serialized_results = {
+                source: [result.model_dump(mode="json") for result in results]
+                for source, results in ranked_results.items()
+            }
+
+            # Cache every source's results in one commit
+            await self._cache_search_results(search_id, serialized_results)
+
             # Generate AI summary
             summary = await self.generate_solution_summary(
                 ranked_results, search_request
@@ -102,21 +262,25 @@ class SolutionSearchService:
 
             # Update search with final results
             final_results = {
-                "database": [
-                    result.model_dump() for result in ranked_results.get("database", [])
-                ],
-                "rag": [
-                    result.model_dump() for result in ranked_results.get("rag", [])
-                ],
-                "web": [
-                    result.model_dump() for result in ranked_results.get("web", [])
-                ],
+                source: serialized_results.get(source, [])
+                for source in SOURCE_PRIORITY
             }
 
             await self._update_search_results(
                 search_id, final_results, summary, confidence_score, progress
             )
 
+            # Only cache outcomes in which every requested source succeeded
+            if not search_errors:
+                _search_cache[cache_key] = {
+                    "results": ranked_results,
+                    "serialized_results": serialized_results,
+                    "final_results": final_results,
+                    "summary": summary,
+                    "confidence_score": confidence_score,
+                    "progress": progress,
+                }
+
             return {
                 "search_id": search_id,
                 "results": ranked_results,
@@ -127,76 +291,114 @@ class SolutionSearchService:
             }
 
         except Exception as e:
-            print(f"Error in comprehensive search: {e}")
+            logger.exception(f"Error in comprehensive search: {e}")
             await self._update_search_status(search_id, SearchStatus.failed)
             raise
 
-    async def _run_database_search(
-        self, search_request: SolutionSearchRequest, search_id: int
-    ) -> List[SearchResult]:
-        """Run database search and cache results"""
-        try:
-            # Perform database search
-            results = await self.database_service.search_similar_incidents(
-                problem_description=search_request.problem_description,
-                department=search_request.department,
-                severity=search_request.severity.value,
-                keywords=search_request.keywords,
-                limit=10,
-            )
-
-            # Cache results
-            await self._cache_search_results(search_id, "database", results)
+    async def _compute_features(
+        self, search_request: SolutionSearchRequest
+    ) -> RequestFeatures:
+        """
+        Compute the search terms and embeddings shared by the search backends
 
-            return results
+        Both embeddings go through the RAG service's cached embedder, so a new
+        request costs at most one batched embedding call.
 
-        except Exception as e:
-            print(f"Database search error: {e}")
-            return []
+        Args:
+            search_request: Search request parameters
 
-    async def _run_rag_search(
-        self, search_request: SolutionSearchRequest, search_id: int
-    ) -> List[SearchResult]:
-        """Run RAG search and cache results"""
-        try:
-            # Perform RAG search
-            results = await self.rag_service.search_excel_data(
-                query=search_request.problem_description,
-                department=search_request.department,
-                limit=8,
+        Returns:
+            Features for the database and RAG searches
+        """
+        sources = search_request.search_sources
+        features = RequestFeatures(
+            search_terms=DatabaseSearchService.extract_search_terms(
+                search_request.problem_description, search_request.keywords
             )
+        )
 
-            # Cache results
-            await self._cache_search_results(search_id, "rag", results)
+        rag_query = None
+        if "rag" in sources and self.rag_service.vector_search_enabled:
+            rag_query = self.rag_service.normalize_query(
+                search_request.problem_description
+            )
+        incident_query = None
+        if "database" in sources:
+            incident_query = DatabaseSearchService.semantic_query_text(
+                search_request.problem_description, search_request.keywords
+            )
 
-            return results
+        async def embed(text):
+            return await self.rag_service.embed_query(text) if text else None
 
+        try:
+            features.query_embedding, features.incident_embedding = (
+                await asyncio.gather(embed(rag_query), embed(incident_query))
+            )
         except Exception as e:
-            print(f"RAG search error: {e}")
-            return []
+            # The backends embed for themselves when no embedding is given
+            logger.exception(f"Error embedding search request: {e}")
 
-    async def _run_web_search(
-        self, search_request: SolutionSearchRequest, search_id: int
+        return features
+
+    async def _run_database_search(
+        self,
+        search_request: SolutionSearchRequest,
+        search_id: int,
+        features: Optional[RequestFeatures] = None,
     ) -> List[SearchResult]:
-        """Run web search and cache results"""
-        try:
-            # Perform web search
-            results = await self.web_service.search_web_solutions(
+        """Run database search"""
+        # Perform database search
+        async with self._sessionmaker() as session:
+            database_service = DatabaseSearchService(session)
+            results = await database_service.search_similar_incidents(
                 problem_description=search_request.problem_description,
                 department=search_request.department,
                 severity=search_request.severity.value,
                 keywords=search_request.keywords,
-                limit=5,
+                limit=MAX_RESULTS_PER_SOURCE["database"],
+                min_relevance=search_request.min_relevance_score or 0.0,
+                precomputed=features,
+                raise_errors=True,
             )
 
-            # Cache results
-            await self._cache_search_results(search_id, "web", results)
+        return results
 
-            return results
+    async def _run_rag_search(
+        self,
+        search_request: SolutionSearchRequest,
+        search_id: int,
+        features: Optional[RequestFeatures] = None,
+    ) -> List[SearchResult]:
+        """Run RAG search"""
+        # Perform RAG search
+        results = await self.rag_service.search_excel_data(
+            query=search_request.problem_description,
+            department=search_request.department,
+            limit=MAX_RESULTS_PER_SOURCE["rag"],
+            min_relevance=search_request.min_relevance_score or 0.0,
+            precomputed=features,
+            raise_errors=True,
+        )
+
+        return results
 
-        except Exception as e:
-            print(f"Web search error: {e}")
-            return []
+    async def _run_web_search(
+        self, search_request: SolutionSearchRequest, search_id: int
+    ) -> List[SearchResult]:
+        """Run web search"""
+        # Perform web search
+        results = await self.web_service.search_web_solutions(
+            problem_description=search_request.problem_description,
+            department=search_request.department,
+            severity=search_request.severity.value,
+            keywords=search_request.keywords,
+            limit=MAX_RESULTS_PER_SOURCE["web"],
+            min_relevance=search_request.min_relevance_score or 0.0,
+            raise_errors=True,
+        )
+
+        return results
 
     async def rank_and_filter_results(
         self,
@@ -215,35 +417,24 @@ class SolutionSearchService:
         Returns:
             Ranked and filtered results
         """
-        try:
-            ranked_results = {}
-
-            for source, results in all_results.items():
-                if not results:
-                    ranked_results[source] = []
-                    continue
-
-                # Apply minimum relevance filter
-                filtered_results = [
-                    result
-                    for result in results
-                    if result.relevance_score >= search_request.min_relevance_score
-                ]
-
-                # Sort by relevance score
-                filtered_results.sort(key=lambda x: x.relevance_score, reverse=True)
-
-                # Limit results per source
-                max_results_per_source = {"database": 8, "rag": 6, "web": 4}
-
-                limit = max_results_per_source.get(source, 5)
-                ranked_results[source] = filtered_results[:limit]
-
-            return ranked_results
-
-        except Exception as e:
-            print(f"Error ranking results: {e}")
-            return all_results
+        # The backends already filter by min_relevance_score, sort best first
+        # and cap each source. What's left is dropping results that an
+        # earlier source in SOURCE_PRIORITY already returned
+        seen = set()
+        ranked_results = {}
+        for source in SOURCE_PRIORITY:
+            if source not in all_results:
+                continue
+
+            unique_results = []
+            for result in all_results[source] or []:
+                fingerprint = _fingerprint(result)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    unique_results.append(result)
+            ranked_results[source] = unique_results
+
+        return ranked_results
 
     async def generate_solution_summary(
         self,
@@ -261,54 +452,16 @@ class SolutionSearchService:
             AI-generated summary
         """
         try:
-            # Count results by source
-            total_results = sum(len(results) for results in ranked_results.values())
-
-            if total_results == 0:
-                return f"No relevant solutions found for your {search_request.severity.value} severity issue in {search_request.department} department. Consider refining your search criteria or consulting with domain experts."
-
-            # Create summary based on results
-            summary_parts = []
-
-            # Database results summary
-            db_results = ranked_results.get("database", [])
-            if db_results:
-                summary_parts.append(
-                    f"Found {len(db_results)} similar incidents in our internal database with proven solutions."
-                )
-
-            # RAG results summary
-            rag_results = ranked_results.get("rag", [])
-            if rag_results:
-                summary_parts.append(
-                    f"Located {len(rag_results)} relevant entries in our knowledge base."
-                )
-
-            # Web results summary
-            web_results = ranked_results.get("web", [])
-            if web_results:
-                summary_parts.append(
-                    f"Identified {len(web_results)} industry best practices and external solutions."
-                )
-
-            # Combine summary parts
-            base_summary = f"Search completed for your {search_request.severity.value} severity issue in {search_request.department} department. "
-            base_summary += " ".join(summary_parts)
-
-            # Add confidence indicator
-            if total_results >= 5:
-                base_summary += " High confidence in the provided solutions."
-            elif total_results >= 2:
-                base_summary += " Moderate confidence in the provided solutions."
-            else:
-                base_summary += (
-                    " Limited results available - consider additional research."
-                )
-
-            return base_summary
+            return _summary_text(
+                len(ranked_results.get("database", ())),
+                len(ranked_results.get("rag", ())),
+                len(ranked_results.get("web", ())),
+                search_request.severity.value,
+                search_request.department,
+            )
 
         except Exception as e:
-            print(f"Error generating summary: {e}")
+            logger.exception(f"Error generating summary: {e}")
             return f"Search completed for your {search_request.severity.value} severity issue in {search_request.department} department. Results are available for review."
 
     def _calculate_confidence_score(
@@ -324,52 +477,37 @@ class SolutionSearchService:
             Confidence score between 0.0 and 1.0
         """
         try:
-            if not ranked_results:
-                return 0.0
-
-            # Calculate weighted confidence based on source reliability and result quality
-            source_weights = {
-                "database": 0.5,  # Highest weight - internal data
-                "rag": 0.3,  # Medium weight - knowledge base
-                "web": 0.2,  # Lower weight - external sources
-            }
-
             total_confidence = 0.0
             total_weight = 0.0
+            source_count = 0
 
-            for source, results in ranked_results.items():
+            # Weighted average relevance across sources, in a fixed order
+            for source, source_weight in SOURCE_WEIGHTS:
+                results = ranked_results.get(source)
                 if not results:
                     continue
 
-                # Calculate average relevance for this source
-                avg_relevance = sum(result.relevance_score for result in results) / len(
-                    results
-                )
-
-                # Weight by source reliability
-                source_weight = source_weights.get(source, 0.1)
-                weighted_confidence = avg_relevance * source_weight
+                total_relevance = 0.0
+                for result in results:
+                    total_relevance += result.relevance_score
 
-                total_confidence += weighted_confidence
+                total_confidence += total_relevance / len(results) * source_weight
                 total_weight += source_weight
+                source_count += 1
+
+            if not source_count:
+                return 0.0
 
-            # Normalize confidence score
-            if total_weight > 0:
-                confidence = total_confidence / total_weight
-            else:
-                confidence = 0.0
+            confidence = total_confidence / total_weight
 
             # Boost confidence if we have results from multiple sources
-            source_count = len(
-                [source for source, results in ranked_results.items() if results]
-            )
             if source_count > 1:
                 confidence *= 1.1  # 10% boost for multi-source results
 
             return min(confidence, 1.0)
 
         except Exception as e:
-            print(f"Error calculating confidence score: {e}")
+            logger.exception(f"Error calculating confidence score: {e}")
             return 0.0
 
     async def _update_search_status(self, search_id: int, status: SearchStatus):
@@ -387,12 +525,17 @@ class SolutionSearchService:
             await self.db.commit()
 
         except Exception as e:
-            print(f"Error updating search status: {e}")
+            logger.exception(f"Error updating search status: {e}")
 
     async def _update_search_progress(self, search_id: int, progress: Dict[str, Any]):
-        """Update search progress in database"""
+        """Update search progress in database, at most once per write interval"""
+        loop = asyncio.get_running_loop()
+        if loop.time() - self._last_progress_write < PROGRESS_WRITE_INTERVAL_SECONDS:
+            return
+        self._last_progress_write = loop.time()
+
         try:
-            from sqlalchemy import update
+            from sqlalchemy import func, update
 
             stmt = (
                 update(SolutionSearch)
@@ -400,11 +543,12 @@ class SolutionSearchService:
                 .values(progress=progress)
             )
 
-            await self.db.execute(stmt)
-            await self.db.commit()
+            async with self._sessionmaker() as session:
+                await session.execute(stmt)
+                await session.commit()
 
         except Exception as e:
-            print(f"Error updating search progress: {e}")
+            logger.exception(f"Error updating search progress: {e}")
 
     async def _update_search_results(
         self,
@@ -416,7 +560,7 @@ class SolutionSearchService:
     ):
         """Update search with final results"""
         try:
-            from sqlalchemy import update
+            from sqlalchemy import func, update
 
             stmt = (
                 update(SolutionSearch)
@@ -424,9 +568,9 @@ class SolutionSearchService:
                 .values(
                     search_results=results,
                     summary=summary,
-                    confidence_score=str(confidence_score),
+                    confidence_score=confidence_score,
                     status=SearchStatus.completed,
-                    completed_at=datetime.utcnow(),
+                    completed_at=func.now(),
                     progress=progress,
                 )
             )
@@ -435,59 +579,61 @@ class SolutionSearchService:
             await self.db.commit()
 
         except Exception as e:
-            print(f"Error updating search results: {e}")
+            logger.exception(f"Error updating search results: {e}")
 
     async def _cache_search_results(
-        self, search_id: int, source: str, results: List[SearchResult]
+        self, search_id: int, serialized_results: Dict[str, List[Dict[str, Any]]]
     ):
-        """Cache search results in database"""
+        """Cache serialized search results from all sources in database"""
         try:
-            # Create cache entry
-            cache_entry = SearchResultCache(
-                search_id=search_id,
-                source=source,
-                result_data=[result.model_dump() for result in results],
-                result_count=len(results),
-                relevance_score=(
-                    str(
-                        sum(result.relevance_score for result in results) / len(results)
-                    )
-                    if results
-                    else "0.0"
-                ),
-            )
+            # Create one cache entry per source
+            cache_entries = [
+                SearchResultCache(
+                    search_id=search_id,
+                    source=source,
+                    result_data=results,
+                    result_count=len(results),
+                    relevance_score=(
+                        sum(result["relevance_score"] for result in results)
+                        / len(results)
+                        if results
+                        else 0.0
+                    ),
+                )
+                for source, results in serialized_results.items()
+            ]
 
-            self.db.add(cache_entry)
+            self.db.add_all(cache_entries)
             await self.db.commit()
 
         except Exception as e:
-            print(f"Error caching search results: {e}")
+            logger.exception(f"Error caching search results: {e}")
 
     async def get_search_statistics(self) -> Dict[str, Any]:
         """Get statistics about solution searches"""
         try:
-            from sqlalchemy import select, func
-
-            # Total searches
-            total_query = select(func.count(SolutionSearch.id))
-            total_result = await self.db.execute(total_query)
-            total_searches = total_result.scalar()
-
-            # Searches by status
-            status_query = select(
-                SolutionSearch.status, func.count(SolutionSearch.id)
-            ).group_by(SolutionSearch.status)
-
-            status_result = await self.db.execute(status_query)
-            status_counts = {row[0].value: row[1] for row in status_result}
-
-            # Searches by department
-            dept_query = select(
-                SolutionSearch.department, func.count(SolutionSearch.id)
-            ).group_by(SolutionSearch.department)
-
-            dept_result = await self.db.execute(dept_query)
-            dept_counts = {row[0]: row[1] for row in dept_result}
+            from sqlalchemy import String, select, func
+
+            # One grouped scan gives every (status, department) count; the
+            # total and both breakdowns are sums over those few rows. Status
+            # comes back as its stored text rather than a SearchStatus
+            breakdown_query = select(
+                SolutionSearch.status.cast(String),
+                SolutionSearch.department,
+                func.count(SolutionSearch.id),
+            ).group_by(SolutionSearch.status, SolutionSearch.department)
+
+            breakdown_result = await self.db.execute(breakdown_query)
+
+            total_searches = 0
+            status_counts: Dict[str, int] = {}
+            dept_counts: Dict[str, int] = {}
+            for search_status, department, count in breakdown_result:
+                total_searches += count
+                status_counts[search_status] = (
+                    status_counts.get(search_status, 0) + count
+                )
+                dept_counts[department] = dept_counts.get(department, 0) + count
 
             return {
                 "total_searches": total_searches,
@@ -496,7 +642,7 @@ class SolutionSearchService:
             }
 
         except Exception as e:
-            print(f"Error getting search statistics: {e}")
+            logger.exception(f"Error getting search statistics: {e}")
             return {
                 "total_searches": 0,
                 "status_breakdown": {},
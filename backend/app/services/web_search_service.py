@@ -35,6 +35,8 @@ class WebSearchService:
         severity: str,
         keywords: Optional[List[str]] = None,
         limit: int = 5,
+        min_relevance: float = 0.0,
+        raise_errors: bool = False,
     ) -> List[SearchResult]:
         """
         Search the web for solutions using OpenAI's web search
@@ -45,6 +47,8 @@ class WebSearchService:
             severity: Severity level
             keywords: Optional additional keywords
             limit: Maximum number of results
+            min_relevance: Minimum relevance score for returned results
+            raise_errors: Raise search failures instead of returning no results
 
         Returns:
             List of SearchResult objects
@@ -69,12 +73,17 @@ class WebSearchService:
             formatted_results = []
             for result in search_results:
                 formatted_result = self._format_web_result(result, problem_description)
-                if formatted_result:
+                if (
+                    formatted_result
+                    and formatted_result.relevance_score >= min_relevance
+                ):
                     print(
                         f"   → Web result: {formatted_result.title} | URL: {formatted_result.url}"
                     )
                     formatted_results.append(formatted_result)
 
+            formatted_results.sort(key=lambda x: x.relevance_score, reverse=True)
+
             print(
                 f"   ← Web search returned {len(formatted_results)} results with URLs"
             )
@@ -82,6 +91,8 @@ class WebSearchService:
 
         except Exception as e:
             print(f"Error in web search: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def search_industry_best_practices(
@@ -323,7 +334,7 @@ class WebSearchService:
             import traceback
 
             traceback.print_exc()
-            return []
+            raise
 
     def _format_web_result(
         self,
@@ -1,9 +1,75 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+import base64
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, asc, func
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    and_,
+    or_,
+    desc,
+    asc,
+    func,
+    lambda_stmt,
+    tuple_,
+    case,
+    cast,
+    literal,
+    literal_column,
+    JSON,
+    String,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from app.models.lesson_learned import LessonLearned, SeverityLevel
 
 
+# Columns needed for list views (skips the large JSON ai_analysis/attachments)
+LIST_ITEM_COLUMNS = [
+    LessonLearned.id,
+    LessonLearned.commodity,
+    LessonLearned.part_number,
+    LessonLearned.supplier,
+    LessonLearned.error_location,
+    LessonLearned.problem_description,
+    LessonLearned.missed_detection,
+    LessonLearned.provided_solution,
+    LessonLearned.department,
+    LessonLearned.severity,
+    LessonLearned.reporter_name,
+    LessonLearned.created_at,
+    LessonLearned.updated_at,
+]
+
+# Columns the list endpoint may sort by; anything else falls back to created_at
+SORTABLE = {
+    "created_at": LessonLearned.created_at,
+    "updated_at": LessonLearned.updated_at,
+    "commodity": LessonLearned.commodity,
+    "department": LessonLearned.department,
+    "severity": LessonLearned.severity,
+    "part_number": LessonLearned.part_number,
+    "supplier": LessonLearned.supplier,
+}
+
+ORDER_FUNCS = {"asc": asc, "desc": desc}
+
+
+def encode_cursor(created_at: datetime, lesson_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{lesson_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        created_at, lesson_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), int(lesson_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 class LessonLearnedRepository:
     """Repository class for LessonLearned database operations"""
 
@@ -21,10 +87,31 @@ class LessonLearnedRepository:
     async def get_by_id(self, lesson_id: int) -> Optional[LessonLearned]:
         """Get a lesson learned record by ID"""
         result = await self.db.execute(
-            select(LessonLearned).where(LessonLearned.id == lesson_id)
+            lambda_stmt(
+                lambda: select(LessonLearned).where(LessonLearned.id == lesson_id)
+            )
         )
         return result.scalar_one_or_none()
 
+    async def get_summary_fields(self, lesson_id: int) -> Optional[Dict[str, Any]]:
+        """Get the summary fields of a lesson without loading the full ai_analysis"""
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: select(
+                    LessonLearned.id,
+                    LessonLearned.commodity,
+                    LessonLearned.department,
+                    LessonLearned.severity,
+                    LessonLearned.ai_analysis["lesson_summary"]
+                    .as_string()
+                    .label("lesson_summary"),
+                    LessonLearned.created_at,
+                ).where(LessonLearned.id == lesson_id)
+            )
+        )
+        row = result.mappings().one_or_none()
+        return dict(row) if row else None
+
     async def get_all(
         self,
         skip: int = 0,
@@ -36,76 +123,308 @@ class LessonLearnedRepository:
         search: Optional[str] = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
-    ) -> List[LessonLearned]:
-        """Get all lesson learned records with filtering and pagination"""
+        columns: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        """
+        Get all lesson learned records with filtering and pagination
+
+        Pass columns (e.g. LIST_ITEM_COLUMNS) to select only those columns; rows
+        are then returned as plain mappings instead of ORM instances.
+        """
+
+        if columns:
+            base = lambda_stmt(lambda: select(*columns), track_on=columns)
+        else:
+            base = lambda_stmt(lambda: select(LessonLearned))
+
+        query = self._apply_filters(
+            base, department, severity, commodity, supplier, search
+        )
+        query = self._apply_sort_and_page(query, skip, limit, sort_by, sort_order)
+
+        result = await self.db.execute(query)
+        if columns:
+            return result.mappings().all()
+        return result.scalars().all()
+
+    async def get_all_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 10,
+        department: Optional[str] = None,
+        severity: Optional[SeverityLevel] = None,
+        commodity: Optional[str] = None,
+        supplier: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        columns: List[Any] = LIST_ITEM_COLUMNS,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get a page of lessons as column mappings together with the filtered total
+
+        The total comes from a COUNT(*) OVER() window on the same query, so the
+        page and the total are fetched in one round-trip.
+        """
+        query = self._apply_filters(
+            lambda_stmt(
+                lambda: select(*columns, func.count().over().label("total")),
+                track_on=columns,
+            ),
+            department,
+            severity,
+            commodity,
+            supplier,
+            search,
+        )
+        query = self._apply_sort_and_page(query, skip, limit, sort_by, sort_order)
+
+        result = await self.db.execute(query)
+        rows = result.mappings().all()
+        if not rows:
+            # An offset past the end returns no rows to carry the window total
+            total = (
+                await self.count(department, severity, commodity, supplier, search)
+                if skip
+                else 0
+            )
+            return [], total
+
+        items = [
+            {key: value for key, value in row.items() if key != "total"}
+            for row in rows
+        ]
+        return items, rows[0]["total"]
+
+    async def get_all_after(
+        self,
+        created_at: datetime,
+        lesson_id: int,
+        limit: int = 10,
+        department: Optional[str] = None,
+        severity: Optional[SeverityLevel] = None,
+        commodity: Optional[str] = None,
+        supplier: Optional[str] = None,
+        search: Optional[str] = None,
+        columns: List[Any] = LIST_ITEM_COLUMNS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the lessons after a keyset position, newest first, as column mappings
+
+        Seeks on (created_at, id) instead of using OFFSET, so the cost doesn't
+        grow with how deep the client has paged.
+        """
+        query = self._apply_filters(
+            lambda_stmt(lambda: select(*columns), track_on=columns),
+            department,
+            severity,
+            commodity,
+            supplier,
+            search,
+        )
+        # Seek from the cursor row's stored created_at so the comparison uses
+        # the exact persisted value (SQLite keeps timestamps as text); the
+        # cursor's own timestamp is only used if that row has been deleted
+        query += lambda s: s.where(
+            tuple_(LessonLearned.created_at, LessonLearned.id)
+            < tuple_(
+                func.coalesce(
+                    select(LessonLearned.created_at)
+                    .where(LessonLearned.id == lesson_id)
+                    .scalar_subquery(),
+                    created_at,
+                ),
+                lesson_id,
+            )
+        )
+        query += lambda s: s.order_by(
+            LessonLearned.created_at.desc(), LessonLearned.id.desc()
+        ).limit(limit)
 
-        query = select(LessonLearned)
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
 
-        # Apply filters
-        filters = []
+    async def count(
+        self,
+        department: Optional[str] = None,
+        severity: Optional[SeverityLevel] = None,
+        commodity: Optional[str] = None,
+        supplier: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        """
+        Count lesson learned records matching the same filters as get_all
 
+        Only issues a Core select, so it also works on a repository built over
+        an AsyncConnection.
+        """
+        query = self._apply_filters(
+            lambda_stmt(lambda: select(func.count()).select_from(LessonLearned)),
+            department,
+            severity,
+            commodity,
+            supplier,
+            search,
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one()
+
+    def _apply_sort_and_page(
+        self, query, skip: int, limit: int, sort_by: str, sort_order: str
+    ):
+        """Apply the list endpoint sorting and offset pagination to a lambda statement"""
+        sort_clause = ORDER_FUNCS.get(sort_order.lower(), desc)(
+            SORTABLE.get(sort_by, LessonLearned.created_at)
+        )
+        # id breaks ties so pages (and cursors taken from them) are stable
+        id_clause = ORDER_FUNCS.get(sort_order.lower(), desc)(LessonLearned.id)
+        query += lambda s: s.order_by(sort_clause, id_clause)
+        query += lambda s: s.offset(skip).limit(limit)
+        return query
+
+    def _apply_filters(
+        self,
+        query,
+        department: Optional[str] = None,
+        severity: Optional[SeverityLevel] = None,
+        commodity: Optional[str] = None,
+        supplier: Optional[str] = None,
+        search: Optional[str] = None,
+    ):
+        """
+        Apply the list endpoint filters to a lambda statement
+
+        Each filter is appended as its own lambda so the compiled SQL is cached
+        per combination of active filters; patterns are built outside the
+        lambdas so only plain values are tracked as bound parameters.
+        """
         if department:
-            filters.append(LessonLearned.department.ilike(department))
+            query += lambda s: s.where(LessonLearned.department.ilike(department))
 
         if severity:
-            filters.append(LessonLearned.severity == severity)
+            query += lambda s: s.where(LessonLearned.severity == severity)
 
         if commodity:
-            filters.append(LessonLearned.commodity.ilike(f"%{commodity}%"))
+            commodity_pattern = f"%{commodity}%"
+            query += lambda s: s.where(
+                LessonLearned.commodity.ilike(commodity_pattern)
+            )
 
         if supplier:
-            filters.append(LessonLearned.supplier.ilike(f"%{supplier}%"))
+            supplier_pattern = f"%{supplier}%"
+            query += lambda s: s.where(LessonLearned.supplier.ilike(supplier_pattern))
 
         if search:
-            search_filter = or_(
-                LessonLearned.commodity.ilike(f"%{search}%"),
-                LessonLearned.problem_description.ilike(f"%{search}%"),
-                LessonLearned.error_location.ilike(f"%{search}%"),
-                LessonLearned.department.ilike(f"%{search}%"),
+            search_pattern = f"%{search}%"
+            query += lambda s: s.where(
+                or_(
+                    LessonLearned.commodity.ilike(search_pattern),
+                    LessonLearned.problem_description.ilike(search_pattern),
+                    LessonLearned.error_location.ilike(search_pattern),
+                    LessonLearned.department.ilike(search_pattern),
+                )
             )
-            filters.append(search_filter)
-
-        if filters:
-            query = query.where(and_(*filters))
-
-        # Apply sorting
-        sort_column = getattr(LessonLearned, sort_by, LessonLearned.created_at)
-        if sort_order.lower() == "desc":
-            query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(asc(sort_column))
-
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        return query
 
     async def update(
         self, lesson_id: int, update_data: Dict[str, Any]
     ) -> Optional[LessonLearned]:
-        """Update a lesson learned record"""
-        lesson = await self.get_by_id(lesson_id)
-        if not lesson:
-            return None
+        """Update a lesson learned record with a single UPDATE ... RETURNING"""
+        values = {
+            key: value
+            for key, value in update_data.items()
+            if key in LessonLearned.__table__.columns
+        }
+        if not values:
+            return await self.get_by_id(lesson_id)
 
-        for key, value in update_data.items():
-            if hasattr(lesson, key):
-                setattr(lesson, key, value)
+        return await self._update_returning(
+            update(LessonLearned)
+            .where(LessonLearned.id == lesson_id)
+            .values(**values)
+        )
 
+    async def _update_returning(self, stmt) -> Optional[LessonLearned]:
+        """Run an UPDATE ... RETURNING for one lesson and commit"""
+        result = await self.db.scalars(
+            stmt.returning(LessonLearned),
+            execution_options={"populate_existing": True},
+        )
+        lesson = result.one_or_none()
         await self.db.commit()
-        await self.db.refresh(lesson)
         return lesson
 
-    async def delete(self, lesson_id: int) -> bool:
-        """Delete a lesson learned record"""
-        lesson = await self.get_by_id(lesson_id)
-        if not lesson:
-            return False
+    async def add_attachments(
+        self, lesson_id: int, filenames: List[str]
+    ) -> Optional[LessonLearned]:
+        """Append attachments to a lesson with a single UPDATE ... RETURNING"""
+        # The column may hold SQL NULL or a JSON null; both start a new list
+        attachments = LessonLearned.attachments
+        if self.db.bind.dialect.name == "postgresql":
+            as_jsonb = cast(attachments, JSONB)
+            existing = case(
+                (func.jsonb_typeof(as_jsonb) == "array", as_jsonb),
+                else_=literal([], JSONB),
+            )
+            appended = cast(existing.op("||")(literal(filenames, JSONB)), JSON)
+        else:
+            existing = case(
+                (func.json_type(attachments) == "array", attachments),
+                else_=literal_column("'[]'"),
+            )
+            # '$[#]' appends to a SQLite JSON array
+            appended = func.json_insert(
+                existing,
+                *(arg for filename in filenames for arg in ("$[#]", filename)),
+            )
 
-        await self.db.delete(lesson)
+        return await self._update_returning(
+            update(LessonLearned)
+            .where(LessonLearned.id == lesson_id)
+            .values(attachments=appended)
+        )
+
+    async def remove_attachment(
+        self, lesson_id: int, filename: str
+    ) -> Optional[LessonLearned]:
+        """
+        Remove an attachment from a lesson with a single UPDATE ... RETURNING
+
+        Returns None if the lesson doesn't exist or doesn't have the attachment.
+        """
+        attachments = LessonLearned.attachments
+        if self.db.bind.dialect.name == "postgresql":
+            as_jsonb = cast(attachments, JSONB)
+            has_attachment = as_jsonb.has_key(filename)
+            remaining = cast(as_jsonb.op("-")(literal(filename, String)), JSON)
+        else:
+            elements = func.json_each(attachments).table_valued("value")
+            has_attachment = (
+                select(elements.c.value).where(elements.c.value == filename).exists()
+            )
+            remaining = (
+                select(func.json_group_array(elements.c.value))
+                .where(elements.c.value != filename)
+                .scalar_subquery()
+            )
+
+        return await self._update_returning(
+            update(LessonLearned)
+            .where(LessonLearned.id == lesson_id, has_attachment)
+            .values(attachments=remaining)
+        )
+
+    async def delete(self, lesson_id: int) -> bool:
+        """Delete a lesson learned record with a single DELETE ... RETURNING"""
+        result = await self.db.execute(
+            delete(LessonLearned)
+            .where(LessonLearned.id == lesson_id)
+            .returning(LessonLearned.id)
+        )
+        deleted_id = result.scalar_one_or_none()
         await self.db.commit()
-        return True
+        return deleted_id is not None
 
     async def get_departments(self) -> List[str]:
         """Get all unique departments"""
@@ -14,7 +14,7 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription } from "@/components/ui/alert";
 import { departmentService, lessonService } from "@/services";
-import type { LessonLearned } from "@/types/api";
+import type { LessonLearnedListItem } from "@/types/api";
 
 // Define the actual backend response structure
 interface DepartmentInsightsResponse {
@@ -88,7 +88,7 @@ const DepartmentDetails = () => {
   const [insights, setInsights] = useState<DepartmentInsightsResponse | null>(
     null
   );
-  const [lessons, setLessons] = useState<LessonLearned[]>([]);
+  const [lessons, setLessons] = useState<LessonLearnedListItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [aiRegenerating, setAiRegenerating] = useState(false);
   const [error, setError] = useState<string | null>(null);
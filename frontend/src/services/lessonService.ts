@@ -3,6 +3,7 @@
 import { apiClient } from "./api";
 import {
   LessonLearned,
+  LessonLearnedListItem,
   LessonLearnedCreate,
   PaginatedResponse,
   LessonFilters,
@@ -14,7 +15,7 @@ export const lessonService = {
    */
   async getLessons(
     filters?: LessonFilters
-  ): Promise<PaginatedResponse<LessonLearned>> {
+  ): Promise<PaginatedResponse<LessonLearnedListItem>> {
     const params = new URLSearchParams();
 
     if (filters) {
@@ -28,7 +29,7 @@ export const lessonService = {
     const queryString = params.toString();
     const url = queryString ? `/lessons?${queryString}` : "/lessons";
 
-    return apiClient.get<PaginatedResponse<LessonLearned>>(url);
+    return apiClient.get<PaginatedResponse<LessonLearnedListItem>>(url);
   },
 
   /**
@@ -27,6 +27,12 @@ export interface LessonLearned {
   updated_at: string;
 }
 
+// List endpoint items omit the large attachments/ai_analysis fields
+export type LessonLearnedListItem = Omit<
+  LessonLearned,
+  "attachments" | "ai_analysis"
+>;
+
 export interface LessonLearnedCreate {
   commodity: string;
   part_number?: string;
@@ -69,6 +75,7 @@ export interface PaginatedResponse<T> {
   page: number;
   limit: number;
   pages: number;
+  next_cursor?: string | null;
 }
 
 export interface DepartmentSummary {
@@ -133,4 +140,5 @@ export interface LessonFilters {
   end_date?: string;
   sort_by?: "created_at" | "updated_at" | "severity";
   sort_order?: "asc" | "desc";
+  cursor?: string;
 }